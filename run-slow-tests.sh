@@ -7,8 +7,16 @@ echo "Running slow tests..."
 echo "These tests may take several minutes to complete."
 echo ""
 
+# Set TESTMON=1 to only rerun tests affected by changed code
+TESTMON_ARGS=""
+if [ -n "$TESTMON" ]; then
+    # -n 0 keeps xdist loaded, so the -n option in the ini still parses,
+    # but runs in one process as testmon requires
+    TESTMON_ARGS="--testmon -n 0"
+fi
+
 # Run slow tests with longer timeout
-python -m pytest tests/slow/ -v --tb=short --timeout=600
+python -m pytest tests/slow/ -v --tb=short --timeout=120 $TESTMON_ARGS
 
 echo ""
 echo "Slow tests completed!"
@@ -10,6 +10,7 @@ import argparse
 import logging
 import sys
 from pathlib import Path
+from typing import List, Optional
 
 from dotenv import load_dotenv
 
@@ -109,13 +110,13 @@ def create_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def main() -> int:
-    """Main entry point for the CLI."""
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point for the CLI; argv defaults to sys.argv[1:]."""
     # Load environment variables first
     load_dotenv()
 
     parser = create_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Setup logging
     setup_logging(args.log_config, args.log_file)
@@ -5,16 +5,16 @@ Copyright (c) 2025 Julien Simon <julien@julien.org>
 Licensed under CC BY-NC 4.0: https://creativecommons.org/licenses/by-nc/4.0/
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import Optional, Tuple
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Config:
     """Configuration for the Gradio MCP Builder."""
 
-    input_files: List[Path]
+    input_files: Tuple[Path, ...]
     share: bool = False
     model_endpoint: Optional[str] = None
     preserve_docstrings: bool = False
@@ -26,23 +26,33 @@ class Config:
     port: int = 7860
     disable_sample_prompts: bool = False
 
+    # Derived from the fields above in __post_init__
+    server_dir: Path = field(init=False, repr=False)
+    client_dir: Path = field(init=False, repr=False)
+    _use_local_model: bool = field(init=False, repr=False, compare=False)
+    _is_mac_with_mps: bool = field(init=False, repr=False, compare=False)
+
     def __post_init__(self):
         """Validate and set up configuration after initialization."""
-        # Ensure output directory exists
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Accept any iterable of paths; a tuple keeps the config hashable
+        object.__setattr__(self, "input_files", tuple(self.input_files))
+
+        # Set up subdirectories; the instance is frozen, so bypass __setattr__
+        object.__setattr__(self, "server_dir", self.output_dir / "server")
+        object.__setattr__(self, "client_dir", self.output_dir / "client")
 
-        # Set up subdirectories
-        self.server_dir = self.output_dir / "server"
-        self.client_dir = self.output_dir / "client"
+        # Flags read on every model call; the fields they depend on are frozen
+        object.__setattr__(self, "_use_local_model", self.model_endpoint is None)
+        object.__setattr__(self, "_is_mac_with_mps", self.device == "mps")
 
-        # Create subdirectories
+        # Create subdirectories; parents=True creates output_dir with the first
         for directory in [self.server_dir, self.client_dir]:
             directory.mkdir(parents=True, exist_ok=True)
 
     @property
     def use_local_model(self) -> bool:
         """Whether to use a local model instead of an API endpoint."""
-        return self.model_endpoint is None
+        return self._use_local_model
 
     @property
     def model_name(self) -> str:
@@ -52,4 +62,4 @@ class Config:
     @property
     def is_mac_with_mps(self) -> bool:
         """Whether the current device is set to MPS."""
-        return self.device == "mps"
+        return self._is_mac_with_mps
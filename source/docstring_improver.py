@@ -6,13 +6,76 @@ import os
 import re
 from typing import List
 
-import torch
-from transformers import AutoModelForCausalLM, AutoTokenizer
-
 from .config import Config
 from .logging_config import get_logger
 from .model_config import ModelConfigLoader
 
+# Lines that look like instructions or meta-commentary from the model
+_SKIP_PATTERNS = (
+    r"^make sure",
+    r"^please",
+    r"^note",
+    r"^also note",
+    r"^for example",
+    r"^lastly",
+    r"^ensure",
+    r"^currently",
+    r"^generated",
+    r"^corrected",
+    r"^accurate",
+    r"^standard",
+    r"^compliant",
+    r"^formatted",
+    r"^version",
+    r"^include exactly",
+    r"^additional output",
+    r"^outside these markers",
+    r"^assumptions",
+    r"^contents inside",
+    r"^guessing",
+    r"^unless explicitly",
+    r"^leave out",
+    r"^assume which",
+    r"^special cases",
+    r"^edge conditions",
+    r"def\s+\w+\(",
+    r"^```",
+    r"here\'?s",
+    r"revised",
+    r"triple quotes",
+    r"markers",
+)
+_SKIP_LINE_RE = re.compile("|".join(_SKIP_PATTERNS), re.IGNORECASE)
+
+_DOUBLE_QUOTE_RUN_RE = re.compile(r'"{3,}')
+_SINGLE_QUOTE_RUN_RE = re.compile(r"'{3,}")
+_QUOTE_RUN_RE = re.compile(r'["""]{4,}')
+_LEADING_STARS_RE = re.compile(r"^\*+\s*")
+_TRAILING_STARS_RE = re.compile(r"\s*\*+$")
+
+# Phrases that mark a cleaned docstring as unusable
+_SUSPICIOUS_PHRASES = (
+    "make sure",
+    "include exactly",
+    "triple quotes",
+    "wait wait",
+    "i see you",
+    "much shorter",
+    "last response",
+    "just return",
+    "markdown",
+    "section",
+    "better still",
+    "even better",
+    "without markdown",
+    "plain doc",
+    "separate them",
+    "i'd say",
+    "simply",
+    "as follows",
+    "or even",
+)
+
 
 class DocstringImprover:
     """Handles improving docstrings and generating test prompts using AI models."""
@@ -40,8 +103,8 @@ class DocstringImprover:
             return "Function documentation."
 
         # Remove multiple consecutive quotes
-        docstring = re.sub(r'"{3,}', '"""', docstring)
-        docstring = re.sub(r"'{3,}", "'''", docstring)
+        docstring = _DOUBLE_QUOTE_RUN_RE.sub('"""', docstring)
+        docstring = _SINGLE_QUOTE_RUN_RE.sub("'''", docstring)
 
         # Remove extra quotes at the beginning and end
         docstring = docstring.strip("'\"")
@@ -58,54 +121,12 @@ class DocstringImprover:
                 continue
 
             # Skip lines that look like instructions or meta-commentary
-            skip_patterns = [
-                r"^make sure",
-                r"^please",
-                r"^note",
-                r"^also note",
-                r"^for example",
-                r"^lastly",
-                r"^ensure",
-                r"^currently",
-                r"^generated",
-                r"^corrected",
-                r"^accurate",
-                r"^standard",
-                r"^compliant",
-                r"^formatted",
-                r"^version",
-                r"^include exactly",
-                r"^additional output",
-                r"^outside these markers",
-                r"^assumptions",
-                r"^contents inside",
-                r"^guessing",
-                r"^unless explicitly",
-                r"^leave out",
-                r"^assume which",
-                r"^special cases",
-                r"^edge conditions",
-                r"def\s+\w+\(",
-                r"^```",
-                r"here\'?s",
-                r"revised",
-                r"triple quotes",
-                r"markers",
-            ]
-
-            # Check if line matches any skip pattern
-            should_skip = False
-            for pattern in skip_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    should_skip = True
-                    break
-
-            if should_skip:
+            if _SKIP_LINE_RE.search(line):
                 continue
 
             # Remove asterisks and other markdown formatting
-            line = re.sub(r"^\*+\s*", "", line)
-            line = re.sub(r"\s*\*+$", "", line)
+            line = _LEADING_STARS_RE.sub("", line)
+            line = _TRAILING_STARS_RE.sub("", line)
 
             # Remove leading/trailing asterisks
             if line.startswith("*") and line.endswith("*") and len(line) > 2:
@@ -119,35 +140,12 @@ class DocstringImprover:
         docstring = "\n".join(cleaned_lines).strip()
 
         # Ensure it doesn't contain problematic characters
-        docstring = re.sub(r'["""]{4,}', '"""', docstring)
+        docstring = _QUOTE_RUN_RE.sub('"""', docstring)
 
         # If the result is empty, too short, or contains suspicious content, use
         # fallback
-        suspicious_phrases = [
-            "make sure",
-            "include exactly",
-            "triple quotes",
-            "wait wait",
-            "i see you",
-            "much shorter",
-            "last response",
-            "just return",
-            "markdown",
-            "section",
-            "better still",
-            "even better",
-            "without markdown",
-            "plain doc",
-            "separate them",
-            "i'd say",
-            "simply",
-            "as follows",
-            "or even",
-        ]
-
-        contains_suspicious = any(
-            phrase in docstring.lower() for phrase in suspicious_phrases
-        )
+        lowered = docstring.lower()
+        contains_suspicious = any(phrase in lowered for phrase in _SUSPICIOUS_PHRASES)
 
         if (
             not docstring
@@ -155,8 +153,8 @@ class DocstringImprover:
             or contains_suspicious
             or "###" in docstring
             or "####" in docstring
-            or "returns" not in docstring.lower()
-            and "args" not in docstring.lower()
+            or "returns" not in lowered
+            and "args" not in lowered
             and len(docstring) > 50
         ):
             return "Function documentation."
@@ -301,6 +299,10 @@ class DocstringImprover:
 
     def _generate_with_local_model(self, prompt: str) -> str:
         """Generate text using a local Hugging Face model."""
+        # Imported here so that loading this module does not pull in torch
+        import torch
+        from transformers import AutoModelForCausalLM, AutoTokenizer
+
         if self._model is None or self._tokenizer is None:
             model_config = self.model_config_loader.load_config()
 
@@ -2,133 +2,63 @@
 Gradio interface generator for MCP functions.
 """
 
+import functools
 from typing import Dict, List
 
 from .parser import MCPFunction
 
+# Gradio input component and example value for each annotated parameter type;
+# anything else (str or unknown) falls back to a textbox
+_TYPE_TO_COMPONENT: Dict[str, str] = {
+    "float": 'gr.Number(label="{name}", value=1.0)',
+    "int": 'gr.Number(label="{name}", value=1, precision=0)',
+    "bool": 'gr.Checkbox(label="{name}", value=False)',
+}
+_DEFAULT_COMPONENT = 'gr.Textbox(label="{name}", value="")'
 
-class GradioGenerator:
-    """Generates Gradio interfaces for MCP functions."""
-
-    def __init__(self, config):
-        self.config = config
-
-    def generate_gradio_interface(
-        self, mcp_functions: List[MCPFunction], improved_docstrings: Dict[str, str]
-    ) -> str:
-        """Generate Gradio interface code."""
-        if len(mcp_functions) == 1:
-            return self._generate_single_interface(
-                mcp_functions[0], improved_docstrings[mcp_functions[0].name]
-            )
-        else:
-            return self._generate_tabbed_interface(mcp_functions, improved_docstrings)
-
-    def _generate_single_interface(
-        self, func: MCPFunction, improved_docstring: str
-    ) -> str:
-        """Generate a single Gradio interface for one function."""
-        params = self._extract_params_from_signature(func.signature)
-
-        inputs = []
-        for param_name, param_type in params:
-            if param_type == "float":
-                inputs.append(f'gr.Number(label="{param_name}", value=1.0)')
-            elif param_type == "int":
-                inputs.append(f'gr.Number(label="{param_name}", value=1, precision=0)')
-            elif param_type == "bool":
-                inputs.append(f'gr.Checkbox(label="{param_name}", value=False)')
-            else:  # str or other
-                inputs.append(f'gr.Textbox(label="{param_name}", value="")')
-
-        # Generate example inputs
-        examples = []
-        for param_name, param_type in params:
-            if param_type == "float":
-                examples.append("1.5")
-            elif param_type == "int":
-                examples.append("1")
-            elif param_type == "bool":
-                examples.append("True")
-            else:
-                examples.append('"hello"')
+_TYPE_TO_EXAMPLE: Dict[str, str] = {"float": "1.5", "int": "1", "bool": "True"}
+_DEFAULT_EXAMPLE = '"hello"'
 
-        inputs_str = ",\n            ".join(inputs)
-        return f'''
+# Code templates, filled in with str.format
+_SINGLE_TEMPLATE = '''
 import gradio as gr
-from server.mcp_server import {func.name}
+from server.mcp_server import {name}
 
 def interface():
     return gr.Interface(
-        fn={func.name},
+        fn={name},
         inputs=[
-            {inputs_str},
+            {inputs},
         ],
         outputs=gr.Textbox(label="Result"),
-        title="{func.name.replace('_', ' ').title()}",
-        description="""{improved_docstring}""",
+        title="{title}",
+        description="""{description}""",
         examples=[
-            [{', '.join(examples)}]
+            [{examples}]
         ]
     )
 
 if __name__ == "__main__":
-    interface().launch(share={self.config.share})
+    interface().launch(share={share})
 '''
 
-    def _generate_tabbed_interface(
-        self, functions: List[MCPFunction], improved_docstrings: Dict[str, str]
-    ) -> str:
-        """Generate a tabbed Gradio interface for multiple functions."""
-        tab_interfaces = []
-
-        for func in functions:
-            params = self._extract_params_from_signature(func.signature)
-
-            inputs = []
-            for param_name, param_type in params:
-                if param_type == "float":
-                    inputs.append(f'gr.Number(label="{param_name}", value=1.0)')
-                elif param_type == "int":
-                    inputs.append(
-                        f'gr.Number(label="{param_name}", value=1, precision=0)'
-                    )
-                elif param_type == "bool":
-                    inputs.append(f'gr.Checkbox(label="{param_name}", value=False)')
-                else:  # str or other
-                    inputs.append(f'gr.Textbox(label="{param_name}", value="")')
-
-            # Generate example inputs
-            examples = []
-            for param_name, param_type in params:
-                if param_type == "float":
-                    examples.append("1.5")
-                elif param_type == "int":
-                    examples.append("1")
-                elif param_type == "bool":
-                    examples.append("True")
-                else:
-                    examples.append('"hello"')
-
-            inputs_str = ",\n                    ".join(inputs)
-            tab_interface = f'''
-        with gr.Tab("{func.name.replace('_', ' ').title()}"):
+_TAB_TEMPLATE = '''
+        with gr.Tab("{title}"):
             gr.Interface(
-                fn={func.name},
+                fn={name},
                 inputs=[
-                    {inputs_str},
+                    {inputs},
                 ],
                 outputs=gr.Textbox(label="Result"),
-                description="""{improved_docstrings[func.name]}""",
+                description="""{description}""",
                 examples=[
-                    [{', '.join(examples)}]
+                    [{examples}]
                 ]
             )'''
-            tab_interfaces.append(tab_interface)
 
-        return f"""
+_TABBED_TEMPLATE = """
 import gradio as gr
-from server.mcp_server import {', '.join([func.name for func in functions])}
+from server.mcp_server import {names}
 
 def interface():
     with gr.Blocks() as demo:
@@ -136,14 +66,116 @@ def interface():
         gr.Markdown("Multiple function interface for MCP server")
 
         with gr.Tabs():
-{''.join(tab_interfaces)}
+{tabs}
 
     return demo
 
 if __name__ == "__main__":
-    interface().launch(share={self.config.share})
+    interface().launch(share={share})
 """
 
+
+@functools.lru_cache(maxsize=256)
+def _title(name: str) -> str:
+    """Turn a function name like "add_numbers" into "Add Numbers"."""
+    return name.replace("_", " ").title()
+
+
+def _split_params(signature: str) -> List[str]:
+    """Split the parameter list of "(a: float, b: float) -> float" on top-level commas.
+
+    Commas nested in brackets, as in Dict[str, int], stay inside their type.
+    """
+    params: List[str] = []
+    current: List[str] = []
+    depth = 0
+    for char in signature[1:]:
+        if char in "([{":
+            depth += 1
+        elif char in ")]}":
+            if depth == 0:
+                break  # Closing parenthesis of the parameter list
+            depth -= 1
+        elif char == "," and depth == 0:
+            params.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    params.append("".join(current))
+    return [param.strip() for param in params if param.strip()]
+
+
+class GradioGenerator:
+    """Generates Gradio interfaces for MCP functions."""
+
+    def __init__(self, config):
+        self.config = config
+
+    def generate_gradio_interface(
+        self, mcp_functions: List[MCPFunction], improved_docstrings: Dict[str, str]
+    ) -> str:
+        """Generate Gradio interface code."""
+        if len(mcp_functions) == 1:
+            return self._generate_single_interface(
+                mcp_functions[0], improved_docstrings[mcp_functions[0].name]
+            )
+        else:
+            return self._generate_tabbed_interface(mcp_functions, improved_docstrings)
+
+    def _generate_single_interface(
+        self, func: MCPFunction, improved_docstring: str
+    ) -> str:
+        """Generate a single Gradio interface for one function."""
+        params = self._extract_params_from_signature(func.signature)
+        return _SINGLE_TEMPLATE.format(
+            name=func.name,
+            inputs=",\n            ".join(self._render_inputs(params)),
+            title=_title(func.name),
+            description=improved_docstring,
+            examples=", ".join(self._render_examples(params)),
+            share=self.config.share,
+        )
+
+    def _generate_tabbed_interface(
+        self, functions: List[MCPFunction], improved_docstrings: Dict[str, str]
+    ) -> str:
+        """Generate a tabbed Gradio interface for multiple functions."""
+        tab_interfaces = []
+
+        for func in functions:
+            params = self._extract_params_from_signature(func.signature)
+            tab_interfaces.append(
+                _TAB_TEMPLATE.format(
+                    name=func.name,
+                    inputs=",\n                    ".join(self._render_inputs(params)),
+                    title=_title(func.name),
+                    description=improved_docstrings[func.name],
+                    examples=", ".join(self._render_examples(params)),
+                )
+            )
+
+        return _TABBED_TEMPLATE.format(
+            names=", ".join(func.name for func in functions),
+            tabs="".join(tab_interfaces),
+            share=self.config.share,
+        )
+
+    def _render_inputs(self, params) -> List[str]:
+        """Render one Gradio input component per parameter."""
+        return [
+            _TYPE_TO_COMPONENT.get(param_type, _DEFAULT_COMPONENT).format(
+                name=param_name
+            )
+            for param_name, param_type in params
+        ]
+
+    def _render_examples(self, params) -> List[str]:
+        """Render one example value per parameter."""
+        return [
+            _TYPE_TO_EXAMPLE.get(param_type, _DEFAULT_EXAMPLE)
+            for _, param_type in params
+        ]
+
     def _generate_examples(self, func: MCPFunction) -> str:
         """Generate example inputs for a function."""
         import inspect
@@ -174,19 +206,8 @@ if __name__ == "__main__":
         if not signature.startswith("("):
             return []
 
-        # Extract parameter part
-        param_part = signature.split(")")[0][1:]  # Remove '(' and everything after ')'
-
         params = []
-        if param_part.strip():
-            for param in param_part.split(","):
-                param = param.strip()
-                if ":" in param:
-                    name, type_str = param.split(":", 1)
-                    name = name.strip()
-                    type_str = type_str.strip()
-                    params.append((name, type_str))
-                else:
-                    params.append((param, "str"))  # Default to str
-
+        for param in _split_params(signature):
+            name, _, type_str = param.partition(":")
+            params.append((name.strip(), type_str.strip() or "str"))  # Default to str
         return params
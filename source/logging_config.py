@@ -5,6 +5,7 @@ Logging configuration for the Gradio MCP Builder.
 import json
 import logging
 import logging.config
+import os
 from pathlib import Path
 from typing import Any, Dict
 
@@ -84,7 +85,11 @@ def _update_log_filenames(config: Dict[str, Any], log_file: str) -> None:
                 "errors.log",
                 "error.log",
             ]:
-                # Keep error log separate but update extension to match
+                # Keep error log separate but update extension to match;
+                # a discarded main log discards errors too
+                if log_file == os.devnull:
+                    handler_config["filename"] = os.devnull
+                    continue
                 log_path = Path(log_file)
                 error_log_path = (
                     log_path.parent / f"{log_path.stem}_errors{log_path.suffix}"
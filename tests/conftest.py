@@ -0,0 +1,176 @@
+"""
+Shared pytest fixtures for the unit tests.
+"""
+
+import copy
+import functools
+import logging
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from source.builder import GradioMCPBuilder
+from source.cli import create_parser
+from source.config import Config
+from source.parser import MCPParser
+
+# Slow tests build real projects and need a working filesystem
+_SLOW_DIR = Path(__file__).parent / "slow"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _silence_logging():
+    """Drop all log records for the whole test session."""
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+@pytest.fixture(autouse=True)
+def _no_mkdir(request, monkeypatch):
+    """Replace Path.mkdir with a mock."""
+    if _SLOW_DIR in request.node.path.parents:
+        return None
+    mock = MagicMock()
+    monkeypatch.setattr("pathlib.Path.mkdir", mock)
+    return mock
+
+
+@functools.cache
+def _cached_config(overrides):
+    """Build one Config per distinct set of field overrides."""
+    return Config(**{"input_files": (Path("input/test.py"),), **dict(overrides)})
+
+
+@pytest.fixture(scope="session")
+def make_config():
+    """Factory returning a shared Config for each set of field overrides."""
+
+    def make(**overrides):
+        return _cached_config(tuple(sorted(overrides.items())))
+
+    return make
+
+
+@pytest.fixture(scope="module")
+def default_config(make_config):
+    """Default Config; use make_config() for variants."""
+    return make_config()
+
+
+@pytest.fixture(scope="module")
+def base_config():
+    """Config shared by the builder tests of a module."""
+    return Config(
+        input_files=(Path("test_input.py"),),
+        output_dir=Path("test_output"),
+        preserve_docstrings=False,
+        disable_sample_prompts=False,
+    )
+
+
+@pytest.fixture(scope="module")
+def _builder_template(base_config):
+    """Builder object graph, constructed once per module."""
+    return GradioMCPBuilder(base_config)
+
+
+@pytest.fixture
+def builder(_builder_template):
+    """Shared builder with its mutable state reset for each test."""
+    b = _builder_template
+    b.mcp_functions = []
+    b.helper_functions = []
+    b.module_constants = []
+    b.improved_docstrings = {}
+    b.test_prompts = {}
+    return b
+
+
+@pytest.fixture(scope="module")
+def _mock_fn_template():
+    """MCP function stub built once and copied per test."""
+    return SimpleNamespace(
+        name="test_func", docstring="Original docstring", signature="(a: int)"
+    )
+
+
+@pytest.fixture
+def mock_fn(_mock_fn_template):
+    """Fresh shallow copy of the MCP function stub."""
+    return copy.copy(_mock_fn_template)
+
+
+@pytest.fixture
+def fake_fs(monkeypatch):
+    """Record Path.mkdir and Path.write_text calls in memory instead of on disk."""
+    fs = SimpleNamespace(dirs=[], files={})
+
+    def mkdir(self, *args, **kwargs):
+        fs.dirs.append(self)
+
+    def write_text(self, data, *args, **kwargs):
+        fs.files[self] = data
+        return len(data)
+
+    monkeypatch.setattr(Path, "mkdir", mkdir)
+    monkeypatch.setattr(Path, "write_text", write_text)
+    return fs
+
+
+@pytest.fixture(scope="class")
+def mcp_parser():
+    """MCPParser shared by a test class; each parse resets its state."""
+    return MCPParser()
+
+
+@pytest.fixture(scope="class")
+def py_file(tmp_path_factory):
+    """Factory writing source code to a fresh .py file in a class-wide directory."""
+    directory = tmp_path_factory.mktemp("py_files")
+
+    def make(code):
+        path = directory / f"m_{uuid.uuid4().hex}.py"
+        path.write_text(code)
+        return path
+
+    return make
+
+
+@pytest.fixture(scope="module")
+def parser():
+    """Argument parser shared by the parsing tests."""
+    return create_parser()
+
+
+@pytest.fixture
+def cli_env(monkeypatch):
+    """Patch main()'s collaborators and make every input file exist."""
+    mocks = SimpleNamespace()
+    for name in ("GradioMCPBuilder", "Config", "setup_logging", "get_logger"):
+        mock = MagicMock()
+        monkeypatch.setattr(f"source.cli.{name}", mock)
+        setattr(mocks, name, mock)
+    monkeypatch.setattr("pathlib.Path.exists", lambda self: True)
+    mocks.logger = MagicMock()
+    mocks.get_logger.return_value = mocks.logger
+    return mocks
+
+
+@pytest.fixture
+def mocked_transformers(monkeypatch):
+    """Replace model and tokenizer loading with mocks and hide any GPU."""
+    mocks = SimpleNamespace(tokenizer=MagicMock(), model=MagicMock())
+    mocks.tokenizer_loader = MagicMock(return_value=mocks.tokenizer)
+    mocks.model_loader = MagicMock(return_value=mocks.model)
+    monkeypatch.setattr(
+        "transformers.AutoTokenizer.from_pretrained", mocks.tokenizer_loader
+    )
+    monkeypatch.setattr(
+        "transformers.AutoModelForCausalLM.from_pretrained", mocks.model_loader
+    )
+    monkeypatch.setattr("torch.cuda.is_available", lambda: False)
+    return mocks
@@ -0,0 +1,215 @@
+"""
+Shared fixtures for the slow tests.
+
+Each sample set is built once per session and reused by every test that
+needs its output.
+"""
+
+import contextlib
+import importlib.util
+import io
+import logging
+import os
+import py_compile
+import shutil
+import socket
+import subprocess
+import tempfile
+import uuid
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import pytest
+
+from source.cli import main
+
+BASIC_SAMPLES = ("input-samples/input-hello-world/hello_world.py",)
+SIMPLE_SAMPLES = (
+    "input-samples/input-simple/math_operations.py",
+    "input-samples/input-simple/geometry.py",
+)
+ADVANCED_SAMPLES = (
+    "input-samples/input-advanced/task_storage.py",
+    "input-samples/input-advanced/task_analytics.py",
+    "input-samples/input-advanced/task_utilities.py",
+)
+SAMPLE_SETS = {
+    "basic": BASIC_SAMPLES,
+    "simple": SIMPLE_SAMPLES,
+    "advanced": ADVANCED_SAMPLES,
+}
+
+Build = Tuple[Path, subprocess.CompletedProcess]
+
+
+def build_sample(
+    sample_files: Sequence[str],
+    output_dir: Path,
+    project_root: Path,
+    log_file: Optional[Path] = None,
+) -> subprocess.CompletedProcess:
+    """Build a sample in-process through the CLI entry point.
+
+    Paths are made absolute so the build does not depend on the working
+    directory; the result mimics the one ``subprocess.run`` would return.
+    Build logs are discarded unless a log_file is given.
+    """
+    if log_file is None:
+        log_file = Path(os.devnull)
+    argv = [
+        *(str(project_root / sample_file) for sample_file in sample_files),
+        "--preserve-docstrings",
+        "--disable-sample-prompts",
+        "--output-dir",
+        str(output_dir),
+        "--log-config",
+        str(project_root / "json" / "log_config.json"),
+        "--model-config",
+        str(project_root / "json" / "model_config.json"),
+        "--log-file",
+        str(log_file),
+    ]
+
+    # The unit test conftest silences logging, but callers check the CLI output
+    disabled_level = logging.root.manager.disable
+    logging.disable(logging.NOTSET)
+    stdout, stderr = io.StringIO(), io.StringIO()
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            returncode = main(argv)
+    finally:
+        logging.disable(disabled_level)
+
+    return subprocess.CompletedProcess(
+        ["main.py", *argv], returncode, stdout.getvalue(), stderr.getvalue()
+    )
+
+
+def compile_outputs(output_dir: Path) -> None:
+    """Byte-compile the generated server and client.
+
+    Syntax errors in the generated code surface here, and later imports
+    load the cached bytecode instead of parsing the source again.
+    """
+    for generated in ("server/gradio_server.py", "client/mcp_client.py"):
+        py_compile.compile(str(output_dir / generated), doraise=True)
+
+
+@pytest.fixture(scope="session")
+def project_root():
+    """Get the project root directory."""
+    return Path(__file__).parent.parent.parent
+
+
+@pytest.fixture(scope="session")
+def temp_output_dir(tmp_path_factory, request):
+    """Create a temporary output directory for tests, one per xdist worker.
+
+    Builds write many small files, so they go to the /dev/shm ramdisk when
+    there is one. Set PYTEST_TMPDIR to choose another root.
+    """
+    # xdist's worker_id fixture is missing when xdist is disabled or absent
+    worker_id = getattr(request.config, "workerinput", {}).get("workerid", "master")
+    root = os.environ.get("PYTEST_TMPDIR")
+    if root is None and Path("/dev/shm").is_dir():
+        root = "/dev/shm"
+    if root is None:
+        temp_dir = tmp_path_factory.mktemp(f"mcp_test_{worker_id}")
+    else:
+        temp_dir = Path(tempfile.mkdtemp(prefix=f"mcp_test_{worker_id}_", dir=root))
+    yield temp_dir
+    if temp_dir.exists():
+        shutil.rmtree(temp_dir)
+
+
+@pytest.fixture(scope="session")
+def build(temp_output_dir, project_root):
+    """Build a sample set once per session, keyed by output directory name."""
+    builds: Dict[str, Build] = {}
+
+    def _build(name: str, sample_files: Sequence[str]) -> Build:
+        if name not in builds:
+            output_dir = temp_output_dir / name
+            result = build_sample(sample_files, output_dir, project_root)
+            if result.returncode == 0:
+                compile_outputs(output_dir)
+            builds[name] = (output_dir, result)
+        return builds[name]
+
+    return _build
+
+
+@pytest.fixture(scope="session")
+def built_basic(build):
+    """Output directory and build result of the hello world sample."""
+    return build("basic", SAMPLE_SETS["basic"])
+
+
+@pytest.fixture(scope="session")
+def built_simple(build):
+    """Output directory and build result of the combined simple samples."""
+    return build("simple", SAMPLE_SETS["simple"])
+
+
+@pytest.fixture(scope="session")
+def built_advanced(build):
+    """Output directory and build result of the advanced task samples."""
+    return build("advanced", SAMPLE_SETS["advanced"])
+
+
+@pytest.fixture
+def free_port():
+    """A TCP port that was free when the test started, picked by the OS."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def load_server_module(server_file: Path) -> ModuleType:
+    """Import a generated gradio_server.py as a fresh, uniquely named module.
+
+    Nothing is added to sys.path or sys.modules, so servers from different
+    builds never shadow each other.
+    """
+    spec = importlib.util.spec_from_file_location(
+        f"gradio_server_{uuid.uuid4().hex}", server_file
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def assert_outputs(root: Path, expected: Iterable[str]) -> None:
+    """Assert that every expected file, relative to root, was generated."""
+    found = {path.relative_to(root).as_posix() for path in root.rglob("*")}
+    missing = set(expected) - found
+    assert not missing, f"Missing generated files: {sorted(missing)}"
+
+
+@pytest.fixture(scope="session")
+def outputs_exist():
+    """Checker for generated files; see assert_outputs()."""
+    return assert_outputs
+
+
+class _ServerModules(dict):
+    """Generated server modules by sample key, built and loaded on first use."""
+
+    def __init__(self, build):
+        super().__init__()
+        self._build = build
+
+    def __missing__(self, key: str) -> ModuleType:
+        output_dir, result = self._build(key, SAMPLE_SETS[key])
+        assert result.returncode == 0, f"Build failed: {result.stderr}"
+        module = self[key] = load_server_module(
+            output_dir / "server" / "gradio_server.py"
+        )
+        return module
+
+
+@pytest.fixture(scope="session")
+def server_modules(build):
+    """Each sample's generated server, imported once per session."""
+    return _ServerModules(build)
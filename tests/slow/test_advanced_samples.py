@@ -5,162 +5,144 @@ These tests are excluded from CI due to their long runtime.
 They test complex scenarios with multiple files and advanced functionality.
 """
 
+import copy
 import json
-import subprocess
-import sys
-import threading
-import time
-from pathlib import Path
-from typing import List
+from types import ModuleType
 
 import pytest
 import requests
-
-# Import fixtures from the moved test module
-from .test_input_samples import project_root, temp_output_dir
+from urllib3.exceptions import ReadTimeoutError
 
 
 class ServerProcess:
-    """Helper class to manage server processes for testing."""
+    """Serves a generated server's demo from a thread of the test process."""
 
-    def __init__(self, server_path: Path, port: int):
-        self.server_path = server_path
+    def __init__(self, server_module: ModuleType, port: int):
+        self.demo = server_module.demo
         self.port = port
-        self.process = None
-        self.base_url = f"http://localhost:{port}"
+        self.running = False
+        self.base_url = f"http://127.0.0.1:{port}"
 
     def start(self) -> bool:
-        """Start the server process."""
+        """Launch the demo on this server's port."""
         try:
-            self.process = subprocess.Popen(
-                [sys.executable, str(self.server_path)],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
+            # Returns once uvicorn is serving, so there is nothing to wait for
+            self.demo.launch(
+                server_name="127.0.0.1",
+                server_port=self.port,
+                share=False,
+                quiet=True,
+                mcp_server=True,
+                prevent_thread_lock=True,
             )
-            # Wait for server to start
-            time.sleep(3)
+            self.running = True
             return self.is_running()
         except Exception as e:
             print(f"Failed to start server: {e}")
             return False
 
     def stop(self):
-        """Stop the server process."""
-        if self.process:
-            self.process.terminate()
-            try:
-                self.process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                self.process.kill()
-            self.process = None
+        """Stop the server."""
+        if self.running:
+            self.demo.close()
+            self.running = False
 
     def is_running(self) -> bool:
         """Check if server is running."""
-        if not self.process:
+        if not self.running:
             return False
         try:
             response = requests.get(f"{self.base_url}/", timeout=2)
             return response.status_code == 200
-        except:
+        except requests.RequestException:
             return False
 
 
-class TestAdvancedSamples:
-    """Test advanced input samples (slow tests)."""
+@pytest.fixture
+def advanced_output_dir(built_advanced):
+    """Output directory of the shared advanced build, skipping if it failed."""
+    output_dir, result = built_advanced
+    if result.returncode != 0:
+        pytest.skip("Advanced build failed, see test_advanced_task_build")
+    return output_dir
 
-    def test_advanced_task_build(self, temp_output_dir, project_root):
-        """Test building advanced task management example."""
-        # Build the advanced example
-        sample_files = [
-            "input-samples/input-advanced/task_storage.py",
-            "input-samples/input-advanced/task_analytics.py",
-            "input-samples/input-advanced/task_utilities.py",
-        ]
-        result = self.build_sample(
-            sample_files, temp_output_dir / "mcp_advanced", project_root
-        )
-        assert result.returncode == 0
 
-        # Check that output files exist
-        output_dir = temp_output_dir / "mcp_advanced"
-        assert (output_dir / "server" / "gradio_server.py").exists()
-        assert (output_dir / "client" / "mcp_client.py").exists()
-        assert (output_dir / "requirements.txt").exists()
-        assert (output_dir / "config.json").exists()
+@pytest.fixture
+def task_server(server_modules, tmp_path, monkeypatch):
+    """The shared advanced server with its task state isolated to this test."""
+    gradio_server = server_modules["advanced"]
+    monkeypatch.setattr(gradio_server, "TASKS_FILE", str(tmp_path / "tasks.json"))
+    monkeypatch.setattr(
+        gradio_server, "DUMMY_TASKS", copy.deepcopy(gradio_server.DUMMY_TASKS)
+    )
+    return gradio_server
 
-    def test_advanced_mcp_functions(self, temp_output_dir, project_root):
-        """Test MCP functions in advanced example."""
-        # Build the advanced example
-        sample_files = [
-            "input-samples/input-advanced/task_storage.py",
-            "input-samples/input-advanced/task_analytics.py",
-            "input-samples/input-advanced/task_utilities.py",
-        ]
-        result = self.build_sample(
-            sample_files, temp_output_dir / "mcp_advanced2", project_root
-        )
-        assert result.returncode == 0
 
-        # Import and test the server
-        server_path = temp_output_dir / "mcp_advanced2" / "server"
-        sys.path.insert(0, str(server_path))
+class TestAdvancedSamples:
+    """Test advanced input samples (slow tests)."""
 
-        try:
-            # Force reimport
-            if "gradio_server" in sys.modules:
-                del sys.modules["gradio_server"]
-            import gradio_server
+    def test_advanced_task_build(self, built_advanced, outputs_exist):
+        """Test building advanced task management example."""
+        output_dir, result = built_advanced
+        assert result.returncode == 0, f"Build failed: {result.stderr}"
 
-            # Test task creation
-            result = gradio_server.create_task("Test Task", "Test Description", "high")
-            assert "successfully" in result.lower()
+        outputs_exist(
+            output_dir,
+            {
+                "server/gradio_server.py",
+                "client/mcp_client.py",
+                "requirements.txt",
+                "config.json",
+            },
+        )
 
-            # Test task statistics
-            stats_result = gradio_server.get_task_statistics()
-            stats = json.loads(stats_result)
-            assert "total_tasks" in stats
-            assert "by_status" in stats
-            assert "by_priority" in stats
+    def test_advanced_mcp_structure(self, advanced_output_dir):
+        """Test the advanced server source without importing it."""
+        source = (advanced_output_dir / "server" / "gradio_server.py").read_text()
+
+        # MCP functions plus the helpers they depend on
+        for name in (
+            "create_task",
+            "get_task_statistics",
+            "search_tasks",
+            "_load_tasks",
+            "_save_tasks",
+            "validate_priority",
+        ):
+            assert f"def {name}(" in source
+        assert "with gr.Blocks() as demo:" in source  # Tabbed interface
+
+    @pytest.mark.slow
+    def test_advanced_mcp_callable(self, advanced_output_dir, task_server):
+        """Test MCP functions in advanced example."""
+        gradio_server = task_server
 
-            # Test task search
-            search_result = gradio_server.search_tasks("Test")
-            assert isinstance(search_result, str)
+        # Test task creation
+        result = gradio_server.create_task("Test Task", "Test Description", "high")
+        assert "successfully" in result.lower()
 
-            # Test helper functions are available
-            assert hasattr(gradio_server, "_load_tasks")
-            assert hasattr(gradio_server, "_save_tasks")
-            assert hasattr(gradio_server, "validate_priority")
+        # Test task statistics
+        stats_result = gradio_server.get_task_statistics()
+        stats = json.loads(stats_result)
+        assert "total_tasks" in stats
+        assert "by_status" in stats
+        assert "by_priority" in stats
 
-            # Test demo object exists and is correct type
-            assert hasattr(gradio_server, "demo")
-            import gradio as gr
+        # Test task search
+        search_result = gradio_server.search_tasks("Test")
+        assert isinstance(search_result, str)
 
-            assert isinstance(gradio_server.demo, gr.Blocks)
+        # Test demo object exists and is correct type
+        import gradio as gr
 
-        finally:
-            # Clean up sys.path and modules
-            if str(server_path) in sys.path:
-                sys.path.remove(str(server_path))
-            if "gradio_server" in sys.modules:
-                del sys.modules["gradio_server"]
+        assert hasattr(gradio_server, "demo")
+        assert isinstance(gradio_server.demo, gr.Blocks)
 
-    def test_advanced_server_startup(self, temp_output_dir, project_root):
+    @pytest.mark.timeout(30)
+    def test_advanced_server_startup(self, server_modules, free_port):
         """Test advanced server startup and basic functionality."""
-        # Build the advanced example
-        sample_files = [
-            "input-samples/input-advanced/task_storage.py",
-            "input-samples/input-advanced/task_analytics.py",
-            "input-samples/input-advanced/task_utilities.py",
-        ]
-        result = self.build_sample(
-            sample_files, temp_output_dir / "mcp_advanced3", project_root
-        )
-        assert result.returncode == 0
-
         # Start server
-        server_file = temp_output_dir / "mcp_advanced3" / "server" / "gradio_server.py"
-        server = ServerProcess(server_file, 7891)
+        server = ServerProcess(server_modules["advanced"], free_port)
 
         try:
             assert server.start(), "Failed to start server"
@@ -170,27 +152,16 @@ class TestAdvancedSamples:
             assert response.status_code == 200
 
             # Test Gradio API endpoint
-            api_response = requests.get(f"{server.base_url}/gradio_api/", timeout=5)
+            api_response = requests.get(f"{server.base_url}/gradio_api/info", timeout=5)
             assert api_response.status_code == 200
 
         finally:
             server.stop()
 
-    def test_advanced_client_generation(self, temp_output_dir, project_root):
+    def test_advanced_client_generation(self, advanced_output_dir):
         """Test that advanced client is generated correctly."""
-        # Build the advanced example
-        sample_files = [
-            "input-samples/input-advanced/task_storage.py",
-            "input-samples/input-advanced/task_analytics.py",
-            "input-samples/input-advanced/task_utilities.py",
-        ]
-        result = self.build_sample(
-            sample_files, temp_output_dir / "client_advanced", project_root
-        )
-        assert result.returncode == 0
-
         # Check client file exists and has expected content
-        client_file = temp_output_dir / "client_advanced" / "client" / "mcp_client.py"
+        client_file = advanced_output_dir / "client" / "mcp_client.py"
         assert client_file.exists()
 
         with open(client_file, "r") as f:
@@ -202,152 +173,74 @@ class TestAdvancedSamples:
         assert "search_tasks" in content
         assert "get_productivity_report" in content
 
-    def build_sample(
-        self, sample_files: List[str], output_dir: Path, project_root: Path
-    ) -> subprocess.CompletedProcess:
-        """Build a sample using the CLI."""
-        cmd = [
-            sys.executable,
-            "main.py",
-            *sample_files,
-            "--preserve-docstrings",
-            "--disable-sample-prompts",
-            "--output-dir",
-            str(output_dir),
-            "--log-file",
-            f"log/builds/test_mcp_{int(time.time())}.log",
-        ]
-
-        return subprocess.run(
-            cmd,
-            cwd=project_root,
-            capture_output=True,
-            text=True,
-            timeout=600,  # 10 minutes for slow tests
-        )
-
 
 class TestAdvancedEndToEnd:
     """End-to-end tests for advanced samples (slow tests)."""
 
-    def test_e2e_advanced_tasks(self, temp_output_dir, project_root):
+    @pytest.mark.timeout(30)
+    def test_e2e_advanced_tasks(self, advanced_output_dir, free_port, task_server):
         """End-to-end test for advanced task management example."""
         print("\n=== Testing Advanced Tasks (E2E) ===")
 
-        # 1. Build the server and client
-        sample_files = [
-            "input-samples/input-advanced/task_storage.py",
-            "input-samples/input-advanced/task_analytics.py",
-            "input-samples/input-advanced/task_utilities.py",
-        ]
-        build_dir = temp_output_dir / "e2e_advanced"
-
-        print("Building server and client...")
-        result = self.build_sample(sample_files, build_dir, project_root)
-        assert result.returncode == 0, f"Build failed: {result.stderr}"
-        print("✅ Build successful")
-
-        # 2. Launch the server
-        server_file = build_dir / "server" / "gradio_server.py"
-        server = ServerProcess(server_file, 7892)
+        # 1. Launch the server from the shared build
+        server = ServerProcess(task_server, free_port)
 
         try:
             print("Starting server...")
             assert server.start(), "Failed to start server"
             print("✅ Server started successfully")
 
-            # 3. Test MCP SSE endpoint for advanced server
+            # 2. Test MCP SSE endpoint for advanced server
             print("Testing MCP SSE endpoint...")
             mcp_url = f"{server.base_url}/gradio_api/mcp/sse"
             try:
-                response = requests.get(mcp_url, timeout=3, stream=True)
-                assert (
-                    response.status_code == 200
-                ), f"MCP SSE endpoint returned {response.status_code}"
+                with requests.get(mcp_url, timeout=(1, 0.5), stream=True) as response:
+                    assert (
+                        response.status_code == 200
+                    ), f"MCP SSE endpoint returned {response.status_code}"
+                    assert response.raw.read(1), "MCP SSE endpoint sent no data"
                 print("✅ MCP SSE endpoint accessible")
-            except requests.exceptions.ReadTimeout:
-                print("✅ MCP SSE endpoint opened (timeout normal)")
-            except Exception as e:
-                print(f"⚠️ MCP SSE endpoint error: {e}")
+            except (requests.exceptions.ReadTimeout, ReadTimeoutError):
+                pytest.fail("MCP SSE endpoint sent no data before the read timeout")
 
-            # 4. Test complex task management workflow
-            sys.path.insert(0, str(server_file.parent))
-            try:
-                import gradio_server
-
-                # Test task creation
-                result1 = gradio_server.create_task(
-                    "E2E Test Task", "Testing end-to-end workflow", "high"
-                )
-                assert (
-                    "successfully" in result1.lower()
-                ), f"create_task failed: {result1}"
-                print(f"✅ Task created: {result1}")
-
-                # Test task statistics
-                stats_json = gradio_server.get_task_statistics()
-                stats = json.loads(stats_json)
-                assert "total_tasks" in stats, "Statistics missing total_tasks"
-                assert stats["total_tasks"] >= 1, "Should have at least 1 task"
-                print(f"✅ Task statistics: {stats['total_tasks']} total tasks")
-
-                # Test task search
-                search_result = gradio_server.search_tasks("E2E")
-                assert isinstance(search_result, str), "Search should return string"
-                print(f"✅ Task search completed: {len(search_result)} chars returned")
-
-                # Test helper functions are available
-                assert hasattr(
-                    gradio_server, "_load_tasks"
-                ), "Helper function _load_tasks missing"
-                assert hasattr(
-                    gradio_server, "_save_tasks"
-                ), "Helper function _save_tasks missing"
-                assert hasattr(
-                    gradio_server, "TASKS_FILE"
-                ), "Constant TASKS_FILE missing"
-                print("✅ Helper functions and constants available")
-
-                # Verify it's using Blocks (tabbed interface)
-                import gradio as gr
-
-                assert isinstance(
-                    gradio_server.demo, gr.Blocks
-                ), "Should use Blocks for multiple functions"
-                print("✅ Using Blocks interface for multiple functions")
-
-            finally:
-                if str(server_file.parent) in sys.path:
-                    sys.path.remove(str(server_file.parent))
-                if "gradio_server" in sys.modules:
-                    del sys.modules["gradio_server"]
+            # 3. Test complex task management workflow
+            gradio_server = task_server
+
+            # Test task creation
+            result1 = gradio_server.create_task(
+                "E2E Test Task", "Testing end-to-end workflow", "high"
+            )
+            assert "successfully" in result1.lower(), f"create_task failed: {result1}"
+            print(f"✅ Task created: {result1}")
+
+            # Test task statistics
+            stats_json = gradio_server.get_task_statistics()
+            stats = json.loads(stats_json)
+            assert "total_tasks" in stats, "Statistics missing total_tasks"
+            assert stats["total_tasks"] >= 1, "Should have at least 1 task"
+            print(f"✅ Task statistics: {stats['total_tasks']} total tasks")
+
+            # Test task search
+            search_result = gradio_server.search_tasks("E2E")
+            assert isinstance(search_result, str), "Search should return string"
+            print(f"✅ Task search completed: {len(search_result)} chars returned")
+
+            # Test helper functions are available
+            expected = {"_load_tasks", "_save_tasks", "TASKS_FILE"}
+            missing = expected - vars(gradio_server).keys()
+            assert not missing, f"Helpers or constants missing: {sorted(missing)}"
+            print("✅ Helper functions and constants available")
+
+            # Verify it's using Blocks (tabbed interface)
+            import gradio as gr
+
+            assert isinstance(
+                gradio_server.demo, gr.Blocks
+            ), "Should use Blocks for multiple functions"
+            print("✅ Using Blocks interface for multiple functions")
 
         finally:
             server.stop()
             print("✅ Server stopped")
 
         print("✅ Advanced Tasks E2E test completed successfully\n")
-
-    def build_sample(
-        self, sample_files: List[str], output_dir: Path, project_root: Path
-    ) -> subprocess.CompletedProcess:
-        """Build a sample using the CLI."""
-        cmd = [
-            sys.executable,
-            "main.py",
-            *sample_files,
-            "--preserve-docstrings",
-            "--disable-sample-prompts",
-            "--output-dir",
-            str(output_dir),
-            "--log-file",
-            f"log/builds/e2e_test_{int(time.time())}.log",
-        ]
-
-        return subprocess.run(
-            cmd,
-            cwd=project_root,
-            capture_output=True,
-            text=True,
-            timeout=600,  # 10 minutes for slow tests
-        )
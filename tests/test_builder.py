@@ -3,373 +3,362 @@
 Test suite for the GradioMCPBuilder class.
 """
 
-import unittest
+import contextlib
+import copy
+import dataclasses
+import io
+import json
 from pathlib import Path
-from unittest.mock import MagicMock, mock_open, patch
-
-from source.builder import GradioMCPBuilder
-from source.config import Config
-
-
-class TestGradioMCPBuilder(unittest.TestCase):
-    """Test cases for GradioMCPBuilder."""
-
-    def setUp(self):
-        """Set up test fixtures."""
-        self.config = Config(
-            input_files=[Path("test_input.py")],
-            output_dir=Path("test_output"),
-            preserve_docstrings=False,
-            disable_sample_prompts=False,
-        )
-        self.builder = GradioMCPBuilder(self.config)
-
-    def test_builder_initialization(self):
-        """Test builder initialization."""
-        assert self.builder.config == self.config
-        assert hasattr(self.builder, "logger")
-        assert hasattr(self.builder, "parser")
-        assert hasattr(self.builder, "docstring_improver")
-        assert hasattr(self.builder, "gradio_generator")
-        assert hasattr(self.builder, "server_generator")
-        assert hasattr(self.builder, "client_generator")
-
-        assert hasattr(self.builder, "doc_generator")
-        assert hasattr(self.builder, "req_generator")
-        assert self.builder.mcp_functions == []
-        assert self.builder.helper_functions == []
-        assert self.builder.module_constants == []
-        assert self.builder.improved_docstrings == {}
-        assert self.builder.test_prompts == {}
-
-    @patch("builtins.open", new_callable=mock_open)
-    @patch("pathlib.Path.mkdir")
-    @patch("pathlib.Path.exists", return_value=True)
-    @patch.object(Path, "write_text")
-    def test_build_success(
-        self, mock_write_text, mock_exists, mock_mkdir, mock_file_open
-    ):
-        """Test successful build process."""
-        # Mock parser results
-        mock_function = MagicMock()
-        mock_function.name = "test_func"
-        mock_function.docstring = "Original docstring"
-
-        parser_result = {
-            "mcp_functions": [mock_function],
-            "helper_functions": [],
-            "module_constants": [],
-            "other_functions": [],
-            "module_docstring": "Test module",
-            "module_imports": [],
-            "content": "test content",
-        }
-
-        with patch.object(
-            self.builder.parser, "parse_file", return_value=parser_result
-        ), patch.object(
-            self.builder.docstring_improver,
-            "improve_function_docstring",
-            return_value="improved doc",
-        ), patch.object(
-            self.builder.docstring_improver,
-            "generate_test_prompts",
-            return_value=["prompt1"],
-        ), patch.object(
-            self.builder.server_generator,
-            "generate_server",
-            return_value="server content",
-        ), patch.object(
-            self.builder.server_generator,
-            "generate_init_file",
-            return_value="server init",
-        ), patch.object(
-            self.builder.client_generator,
-            "generate_client",
-            return_value="client content",
-        ), patch.object(
-            self.builder.doc_generator, "generate_readme", return_value="readme content"
-        ), patch.object(
-            self.builder.req_generator,
-            "generate_requirements",
-            return_value="requirements content",
-        ), patch.object(
-            self.builder, "_generate_config_file"
-        ) as mock_config_gen, patch.object(
-            self.builder.logger, "info"
-        ), patch.object(
-            self.builder.logger, "debug"
-        ), patch.object(
-            self.builder.logger, "error"
-        ):
-            self.builder.build()
-
-            # Verify function was added
-            assert len(self.builder.mcp_functions) == 1
-            assert self.builder.mcp_functions[0].name == "test_func"
-            # Verify all generators were called
-            mock_config_gen.assert_called_once()
-
-    def test_parse_input_files(self):
-        """Test parsing input files."""
-        mock_function1 = MagicMock()
-        mock_function1.name = "func1"
-        mock_function2 = MagicMock()
-        mock_function2.name = "func2"
-
-        parser_result = {
-            "mcp_functions": [mock_function1, mock_function2],
-            "helper_functions": [],
-            "module_constants": [],
-            "other_functions": [],
-            "module_docstring": "Test module",
-            "module_imports": [],
-            "content": "test content",
-        }
-
-        with patch.object(
-            self.builder.parser, "parse_file", return_value=parser_result
-        ):
-            self.builder._parse_input_files()
-
-            assert len(self.builder.mcp_functions) == 2
-            assert self.builder.mcp_functions[0].name == "func1"
-            assert self.builder.mcp_functions[1].name == "func2"
-
-    def test_parse_input_files_no_functions(self):
-        """Test parsing input files with no MCP functions."""
-        parser_result = {
-            "mcp_functions": [],
-            "helper_functions": [],
-            "module_constants": [],
-            "other_functions": [],
-            "module_docstring": "Test module",
-            "module_imports": [],
-            "content": "test content",
-        }
-
-        with patch.object(
-            self.builder.parser, "parse_file", return_value=parser_result
-        ):
-            with self.assertRaises(ValueError) as context:
-                self.builder._parse_input_files()
-
-            assert "No MCP functions found in input files" in str(context.exception)
-
-    def test_improve_docstrings(self):
-        """Test docstring improvement."""
-        mock_function = MagicMock()
-        mock_function.name = "test_func"
-        mock_function.docstring = "Original docstring"
-        self.builder.mcp_functions = [mock_function]
-
-        with patch.object(
-            self.builder.docstring_improver,
-            "improve_function_docstring",
-            return_value="improved doc",
-        ) as mock_improve:
-            self.builder._improve_docstrings()
-
-            # Function should be processed
-            mock_improve.assert_called_once_with(
-                "test_func", "Original docstring", mock_function.signature
-            )
-            assert self.builder.improved_docstrings["test_func"] == "improved doc"
-
-    def test_improve_docstrings_preserve_original(self):
-        """Test docstring improvement when preserving originals."""
-        self.builder.config.preserve_docstrings = True
-        mock_function = MagicMock()
-        mock_function.name = "test_func"
-        mock_function.docstring = "Original docstring"
-        self.builder.mcp_functions = [mock_function]
-
-        with patch.object(
-            self.builder.docstring_improver, "improve_function_docstring"
-        ) as mock_improve:
-            self.builder._improve_docstrings()
-
-            # Should not call improve when preserving
-            mock_improve.assert_not_called()
-            assert self.builder.improved_docstrings["test_func"] == "Original docstring"
-
-    def test_improve_docstrings_with_error(self):
-        """Test docstring improvement when error occurs."""
-        mock_function = MagicMock()
-        mock_function.name = "test_func"
-        mock_function.docstring = "Original docstring"
-        self.builder.mcp_functions = [mock_function]
-
-        with patch.object(
-            self.builder.docstring_improver,
+
+import pytest
+
+_EMPTY_RESULT = {
+    "mcp_functions": [],
+    "helper_functions": [],
+    "module_constants": [],
+    "other_functions": [],
+    "module_docstring": "Test module",
+    "module_imports": [],
+    "content": "test content",
+}
+
+
+class Spy:
+    """Callable that records its calls and returns a fixed value."""
+
+    __slots__ = ("calls", "ret")
+
+    def __init__(self, ret=None):
+        self.calls = []
+        self.ret = ret
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        return self.ret
+
+
+def _result(**overrides):
+    """Build a parse_file() result, overriding the empty defaults."""
+    result = _EMPTY_RESULT.copy()
+    result.update(overrides)
+    return result
+
+
+def test_builder_initialization(builder, base_config):
+    """Test builder initialization."""
+    assert builder.config == base_config
+    assert hasattr(builder, "logger")
+    assert hasattr(builder, "parser")
+    assert hasattr(builder, "docstring_improver")
+    assert hasattr(builder, "gradio_generator")
+    assert hasattr(builder, "server_generator")
+    assert hasattr(builder, "client_generator")
+
+    assert hasattr(builder, "doc_generator")
+    assert hasattr(builder, "req_generator")
+    assert builder.mcp_functions == []
+    assert builder.helper_functions == []
+    assert builder.module_constants == []
+    assert builder.improved_docstrings == {}
+    assert builder.test_prompts == {}
+
+
+@pytest.fixture
+def stub_collaborators(builder, mock_fn, monkeypatch):
+    """Replace the builder's collaborators with constant-returning stubs."""
+    parser_result = _result(mcp_functions=[mock_fn])
+    config_calls = []
+
+    def generate_config_file(*args, **kwargs):
+        config_calls.append(args)
+
+    stubs = [
+        (builder.parser, "parse_file", lambda *a, **k: parser_result),
+        (
+            builder.docstring_improver,
             "improve_function_docstring",
-            side_effect=Exception("Test error"),
-        ) as mock_improve:
-            self.builder._improve_docstrings()
-
-            # Should fallback to original docstring
-            assert self.builder.improved_docstrings["test_func"] == "Original docstring"
-
-    def test_generate_test_prompts(self):
-        """Test test prompt generation."""
-        mock_function = MagicMock()
-        mock_function.name = "func1"
-        mock_function.docstring = "test docstring"
-        mock_function.signature = "(a: int)"
-        self.builder.mcp_functions = [mock_function]
-        # Set up the improved_docstrings as would be done by _improve_docstrings
-        self.builder.improved_docstrings = {"func1": "improved test docstring"}
-
-        with patch.object(
-            self.builder.docstring_improver,
-            "generate_test_prompts",
-            return_value=["prompt1"],
-        ) as mock_generate:
-            self.builder._generate_test_prompts()
-
-            mock_generate.assert_called_once_with(
-                "func1", "improved test docstring", "(a: int)"
-            )
-            assert "func1" in self.builder.test_prompts
-            assert self.builder.test_prompts["func1"] == ["prompt1"]
-
-    def test_generate_test_prompts_with_error(self):
-        """Test test prompt generation when error occurs."""
-        mock_function = MagicMock()
-        mock_function.name = "func1"
-        mock_function.signature = "(a: int)"
-        self.builder.mcp_functions = [mock_function]
-        self.builder.improved_docstrings = {"func1": "improved test docstring"}
-
-        with patch.object(
-            self.builder.docstring_improver,
+            lambda *a, **k: "improved doc",
+        ),
+        (
+            builder.docstring_improver,
             "generate_test_prompts",
-            side_effect=Exception("Test error"),
-        ):
-            self.builder._generate_test_prompts()
-
-            # Should fallback to empty list
-            assert self.builder.test_prompts["func1"] == []
-
-    @patch("pathlib.Path.mkdir")
-    def test_create_output_directories(self, mock_mkdir):
-        """Test output directory creation."""
-        self.builder._create_output_directories()
-
-        # Should create multiple directories
-        assert (
-            mock_mkdir.call_count >= 3
-        )  # output_dir and subdirectories (server, client)
-
-    @patch("pathlib.Path.write_text")
-    def test_generate_server_files(self, mock_write_text):
-        """Test server file generation."""
-        with patch.object(
-            self.builder.server_generator,
-            "generate_server",
-            return_value="server content",
-        ) as mock_gen_server, patch.object(
-            self.builder.server_generator,
-            "generate_init_file",
-            return_value="init content",
-        ) as mock_gen_init:
-            self.builder._generate_server_files()
-
-            # Should generate both server and init files
-            mock_gen_server.assert_called_once()
-            mock_gen_init.assert_called_once()
-            assert mock_write_text.call_count == 2  # server file + init file
-
-    @patch("pathlib.Path.write_text")
-    def test_generate_client_files(self, mock_write_text):
-        """Test client file generation."""
-        with patch.object(
-            self.builder.client_generator,
-            "generate_client",
-            return_value="client content",
-        ) as mock_gen:
-            self.builder._generate_client_files()
-
-            mock_gen.assert_called_once_with(
-                self.builder.mcp_functions, self.builder.test_prompts
-            )
-            mock_write_text.assert_called_once()
-
-    @patch("pathlib.Path.write_text")
-    def test_generate_documentation(self, mock_write_text):
-        """Test documentation generation."""
-        with patch.object(
-            self.builder.doc_generator, "generate_readme", return_value="readme content"
-        ) as mock_gen:
-            self.builder._generate_documentation()
-
-            mock_gen.assert_called_once_with(
-                self.builder.mcp_functions,
-                self.builder.improved_docstrings,
-                self.builder.test_prompts,
-            )
-            mock_write_text.assert_called_once()
-
-    @patch("pathlib.Path.write_text")
-    def test_generate_requirements(self, mock_write_text):
-        """Test requirements file generation."""
-        with patch.object(
-            self.builder.req_generator,
+            lambda *a, **k: ["prompt1"],
+        ),
+        (builder.server_generator, "generate_server", lambda *a, **k: "server content"),
+        (builder.server_generator, "generate_init_file", lambda *a, **k: "server init"),
+        (builder.client_generator, "generate_client", lambda *a, **k: "client content"),
+        (builder.doc_generator, "generate_readme", lambda *a, **k: "readme content"),
+        (
+            builder.req_generator,
             "generate_requirements",
-            return_value="requirements content",
-        ) as mock_gen:
-            self.builder._generate_requirements()
-
-            mock_gen.assert_called_once()
-            mock_write_text.assert_called_once()
-
-    def test_generate_config_file(self):
-        """Test config file generation."""
-        with patch("builtins.open", mock_open()) as mock_file, patch(
-            "json.dump"
-        ) as mock_json_dump:
-            self.builder._generate_config_file()
-
-            # Should open the config file and write JSON
-            mock_file.assert_called()
-            mock_json_dump.assert_called_once()
-
-    def test_builder_with_helper_functions(self):
-        """Test builder handles helper functions correctly."""
-        mock_mcp_func = MagicMock()
-        mock_mcp_func.name = "mcp_func"
-        mock_helper_func = MagicMock()
-        mock_helper_func.name = "helper_func"
-
-        parser_result = {
-            "mcp_functions": [mock_mcp_func],
-            "helper_functions": [mock_helper_func],
-            "module_constants": ["CONSTANT = 42"],
-            "other_functions": [],
-            "module_docstring": "Test module",
-            "module_imports": [],
-            "content": "test content",
-        }
-
-        with patch.object(
-            self.builder.parser, "parse_file", return_value=parser_result
-        ):
-            self.builder._parse_input_files()
-
-            assert len(self.builder.mcp_functions) == 1
-            assert len(self.builder.helper_functions) == 1
-            assert len(self.builder.module_constants) == 1
-            assert self.builder.mcp_functions[0].name == "mcp_func"
-            assert self.builder.helper_functions[0].name == "helper_func"
-
-    def test_builder_error_handling(self):
-        """Test builder error handling."""
-        with patch.object(
-            self.builder.parser, "parse_file", side_effect=Exception("Parse error")
-        ):
-            with self.assertRaises(Exception):
-                self.builder._parse_input_files()
-
-
-if __name__ == "__main__":
-    unittest.main()
+            lambda *a, **k: "requirements content",
+        ),
+        (builder, "_generate_config_file", generate_config_file),
+    ]
+    for target, name, stub in stubs:
+        monkeypatch.setattr(target, name, stub)
+    return config_calls
+
+
+def test_build_success(builder, stub_collaborators, fake_fs):
+    """Test successful build process."""
+    builder.build()
+
+    # Verify function was added
+    assert len(builder.mcp_functions) == 1
+    assert builder.mcp_functions[0].name == "test_func"
+    output_dir = builder.config.output_dir
+    assert fake_fs.files[output_dir / "server" / "gradio_server.py"] == (
+        "server content"
+    )
+    assert fake_fs.files[output_dir / "client" / "mcp_client.py"] == "client content"
+    assert fake_fs.files[output_dir / "README.md"] == "readme content"
+    # Verify all generators were called
+    assert len(stub_collaborators) == 1
+
+
+def test_parse_input_files(builder, mock_fn, monkeypatch):
+    """Test parsing input files."""
+    mock_function1 = mock_fn
+    mock_function1.name = "func1"
+    mock_function2 = copy.copy(mock_fn)
+    mock_function2.name = "func2"
+
+    parser_result = _result(mcp_functions=[mock_function1, mock_function2])
+
+    monkeypatch.setattr(builder.parser, "parse_file", lambda *a, **k: parser_result)
+    builder._parse_input_files()
+
+    assert len(builder.mcp_functions) == 2
+    assert builder.mcp_functions[0].name == "func1"
+    assert builder.mcp_functions[1].name == "func2"
+
+
+def test_parse_input_files_no_functions(builder, monkeypatch):
+    """Test parsing input files with no MCP functions."""
+    parser_result = _result()
+
+    monkeypatch.setattr(builder.parser, "parse_file", lambda *a, **k: parser_result)
+    with pytest.raises(ValueError, match="No MCP functions found in input files"):
+        builder._parse_input_files()
+
+
+def test_improve_docstrings(builder, mock_fn, monkeypatch):
+    """Test docstring improvement."""
+    mock_function = mock_fn
+    builder.mcp_functions = [mock_function]
+    spy = Spy("improved doc")
+    monkeypatch.setattr(builder.docstring_improver, "improve_function_docstring", spy)
+
+    builder._improve_docstrings()
+
+    # Function should be processed
+    assert len(spy.calls) == 1
+    assert spy.calls[0][0] == (
+        "test_func",
+        "Original docstring",
+        mock_function.signature,
+    )
+    assert builder.improved_docstrings["test_func"] == "improved doc"
+
+
+def test_improve_docstrings_preserve_original(builder, mock_fn, monkeypatch):
+    """Test docstring improvement when preserving originals."""
+    monkeypatch.setattr(
+        builder, "config", dataclasses.replace(builder.config, preserve_docstrings=True)
+    )
+    mock_function = mock_fn
+    builder.mcp_functions = [mock_function]
+    spy = Spy()
+    monkeypatch.setattr(builder.docstring_improver, "improve_function_docstring", spy)
+
+    builder._improve_docstrings()
+
+    # Should not call improve when preserving
+    assert spy.calls == []
+    assert builder.improved_docstrings["test_func"] == "Original docstring"
+
+
+def test_improve_docstrings_with_error(builder, mock_fn, monkeypatch):
+    """Test docstring improvement when error occurs."""
+    mock_function = mock_fn
+    builder.mcp_functions = [mock_function]
+
+    def improve_function_docstring(*args, **kwargs):
+        raise Exception("Test error")
+
+    monkeypatch.setattr(
+        builder.docstring_improver,
+        "improve_function_docstring",
+        improve_function_docstring,
+    )
+    builder._improve_docstrings()
+
+    # Should fallback to original docstring
+    assert builder.improved_docstrings["test_func"] == "Original docstring"
+
+
+def test_generate_test_prompts(builder, mock_fn, monkeypatch):
+    """Test test prompt generation."""
+    mock_function = mock_fn
+    mock_function.name = "func1"
+    mock_function.docstring = "test docstring"
+    builder.mcp_functions = [mock_function]
+    # Set up the improved_docstrings as would be done by _improve_docstrings
+    builder.improved_docstrings = {"func1": "improved test docstring"}
+    spy = Spy(["prompt1"])
+    monkeypatch.setattr(builder.docstring_improver, "generate_test_prompts", spy)
+
+    builder._generate_test_prompts()
+
+    assert len(spy.calls) == 1
+    assert spy.calls[0][0] == ("func1", "improved test docstring", "(a: int)")
+    assert "func1" in builder.test_prompts
+    assert builder.test_prompts["func1"] == ["prompt1"]
+
+
+def test_generate_test_prompts_with_error(builder, mock_fn, monkeypatch):
+    """Test test prompt generation when error occurs."""
+    mock_function = mock_fn
+    mock_function.name = "func1"
+    builder.mcp_functions = [mock_function]
+    builder.improved_docstrings = {"func1": "improved test docstring"}
+
+    def generate_test_prompts(*args, **kwargs):
+        raise Exception("Test error")
+
+    monkeypatch.setattr(
+        builder.docstring_improver, "generate_test_prompts", generate_test_prompts
+    )
+    builder._generate_test_prompts()
+
+    # Should fallback to empty list
+    assert builder.test_prompts["func1"] == []
+
+
+def test_create_output_directories(builder, fake_fs):
+    """Test output directory creation."""
+    builder._create_output_directories()
+
+    # Should create output_dir and its server and client subdirectories
+    output_dir = builder.config.output_dir
+    assert fake_fs.dirs == [output_dir, output_dir / "server", output_dir / "client"]
+
+
+def test_generate_server_files(builder, fake_fs, monkeypatch):
+    """Test server file generation."""
+    server_spy = Spy("server content")
+    init_spy = Spy("init content")
+    monkeypatch.setattr(builder.server_generator, "generate_server", server_spy)
+    monkeypatch.setattr(builder.server_generator, "generate_init_file", init_spy)
+
+    builder._generate_server_files()
+
+    # Should generate both server and init files
+    assert len(server_spy.calls) == 1
+    assert len(init_spy.calls) == 1
+    server_dir = builder.config.output_dir / "server"
+    assert fake_fs.files == {
+        server_dir / "gradio_server.py": "server content",
+        server_dir / "__init__.py": "init content",
+    }
+
+
+def test_generate_client_files(builder, fake_fs, monkeypatch):
+    """Test client file generation."""
+    spy = Spy("client content")
+    monkeypatch.setattr(builder.client_generator, "generate_client", spy)
+
+    builder._generate_client_files()
+
+    assert len(spy.calls) == 1
+    assert spy.calls[0][0] == (builder.mcp_functions, builder.test_prompts)
+    assert fake_fs.files == {
+        builder.config.output_dir / "client" / "mcp_client.py": "client content"
+    }
+
+
+def test_generate_documentation(builder, fake_fs, monkeypatch):
+    """Test documentation generation."""
+    spy = Spy("readme content")
+    monkeypatch.setattr(builder.doc_generator, "generate_readme", spy)
+
+    builder._generate_documentation()
+
+    assert len(spy.calls) == 1
+    assert spy.calls[0][0] == (
+        builder.mcp_functions,
+        builder.improved_docstrings,
+        builder.test_prompts,
+    )
+    assert fake_fs.files == {builder.config.output_dir / "README.md": "readme content"}
+
+
+def test_generate_requirements(builder, fake_fs, monkeypatch):
+    """Test requirements file generation."""
+    spy = Spy("requirements content")
+    monkeypatch.setattr(builder.req_generator, "generate_requirements", spy)
+
+    builder._generate_requirements()
+
+    assert len(spy.calls) == 1
+    assert fake_fs.files == {
+        builder.config.output_dir / "requirements.txt": "requirements content"
+    }
+
+
+def test_generate_config_file(builder, monkeypatch):
+    """Test config file generation."""
+    buf = io.StringIO()
+    opened = []
+
+    def fake_open(path, *args, **kwargs):
+        opened.append(Path(path))
+        return contextlib.nullcontext(buf)
+
+    monkeypatch.setattr("source.builder.open", fake_open, raising=False)
+    builder._generate_config_file()
+
+    # Should open the config file and write JSON
+    assert opened == [builder.config.output_dir / "config.json"]
+    config_data = json.loads(buf.getvalue())
+    assert config_data["server_port"] == builder.config.port
+    assert config_data["client_port"] == builder.config.port + 1
+    assert config_data["mcp_sse_endpoint"] == (
+        f"http://127.0.0.1:{builder.config.port}/gradio_api/mcp/sse"
+    )
+    assert "generated_at" in config_data
+
+
+def test_builder_with_helper_functions(builder, mock_fn, monkeypatch):
+    """Test builder handles helper functions correctly."""
+    mock_mcp_func = mock_fn
+    mock_mcp_func.name = "mcp_func"
+    mock_helper_func = copy.copy(mock_fn)
+    mock_helper_func.name = "helper_func"
+
+    parser_result = _result(
+        mcp_functions=[mock_mcp_func],
+        helper_functions=[mock_helper_func],
+        module_constants=["CONSTANT = 42"],
+    )
+
+    monkeypatch.setattr(builder.parser, "parse_file", lambda *a, **k: parser_result)
+    builder._parse_input_files()
+
+    assert len(builder.mcp_functions) == 1
+    assert len(builder.helper_functions) == 1
+    assert len(builder.module_constants) == 1
+    assert builder.mcp_functions[0].name == "mcp_func"
+    assert builder.helper_functions[0].name == "helper_func"
+
+
+def test_builder_error_handling(builder, monkeypatch):
+    """Test builder error handling."""
+
+    def parse_file(*args, **kwargs):
+        raise Exception("Parse error")
+
+    monkeypatch.setattr(builder.parser, "parse_file", parse_file)
+    with pytest.raises(Exception):
+        builder._parse_input_files()
@@ -3,25 +3,17 @@
 Unit tests for the DocstringImprover class.
 """
 
-import sys
-from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-import pytest
-
-from source.config import Config
 from source.docstring_improver import DocstringImprover
 
-# Add source to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "source"))
-
 
 class TestDocstringImprover:
     """Test class for DocstringImprover functionality."""
 
-    def test_docstring_improver_initialization(self):
+    def test_docstring_improver_initialization(self, default_config):
         """Test DocstringImprover initialization."""
-        config = Config(input_files=[Path("test.py")])
+        config = default_config
         improver = DocstringImprover(config)
 
         assert improver.config == config
@@ -31,9 +23,9 @@ class TestDocstringImprover:
         assert improver._tokenizer is None
         assert not improver._printed_improving_message
 
-    def test_print_improving_message_once(self):
+    def test_print_improving_message_once(self, default_config):
         """Test that improving message is only printed once."""
-        config = Config(input_files=[Path("test.py")])
+        config = default_config
         improver = DocstringImprover(config)
 
         with patch.object(improver.logger, "info") as mock_info:
@@ -46,18 +38,18 @@ class TestDocstringImprover:
             improver._print_improving_message_once()
             mock_info.assert_not_called()
 
-    def test_print_improving_message_preserve_docstrings(self):
+    def test_print_improving_message_preserve_docstrings(self, make_config):
         """Test that improving message is not printed when preserving docstrings."""
-        config = Config(input_files=[Path("test.py")], preserve_docstrings=True)
+        config = make_config(preserve_docstrings=True)
         improver = DocstringImprover(config)
 
         with patch.object(improver.logger, "info") as mock_info:
             improver._print_improving_message_once()
             mock_info.assert_not_called()
 
-    def test_clean_docstring_syntax(self):
+    def test_clean_docstring_syntax(self, default_config):
         """Test docstring cleaning functionality."""
-        config = Config(input_files=[Path("test.py")])
+        config = default_config
         improver = DocstringImprover(config)
 
         # Test with good docstring
@@ -75,9 +67,9 @@ class TestDocstringImprover:
         assert "This has extra quotes" in result
 
     @patch.object(DocstringImprover, "_generate_text")
-    def test_improve_function_docstring(self, mock_generate):
+    def test_improve_function_docstring(self, mock_generate, default_config):
         """Test improving function docstring."""
-        config = Config(input_files=[Path("test.py")])
+        config = default_config
         improver = DocstringImprover(config)
 
         mock_generate.return_value = "Improved docstring for test function."
@@ -91,9 +83,9 @@ class TestDocstringImprover:
         mock_generate.assert_called_once()
 
     @patch.object(DocstringImprover, "_generate_text")
-    def test_generate_test_prompts(self, mock_generate):
+    def test_generate_test_prompts(self, mock_generate, default_config):
         """Test generating test prompts."""
-        config = Config(input_files=[Path("test.py")])
+        config = default_config
         improver = DocstringImprover(config)
 
         mock_generate.return_value = "Test the test_func function with various inputs\nVerify the output format\nCheck edge cases"
@@ -107,9 +99,9 @@ class TestDocstringImprover:
         mock_generate.assert_called_once()
 
     @patch.object(DocstringImprover, "_generate_with_local_model")
-    def test_generate_text_local(self, mock_generate_local):
+    def test_generate_text_local(self, mock_generate_local, make_config):
         """Test generating text with local model."""
-        config = Config(input_files=[Path("test.py")], model_endpoint=None)
+        config = make_config(model_endpoint=None)
         improver = DocstringImprover(config)
 
         mock_generate_local.return_value = "Generated text"
@@ -120,11 +112,9 @@ class TestDocstringImprover:
         mock_generate_local.assert_called_once_with("Test prompt")
 
     @patch.object(DocstringImprover, "_generate_with_api")
-    def test_generate_text_api(self, mock_generate_api):
+    def test_generate_text_api(self, mock_generate_api, make_config):
         """Test generating text with API."""
-        config = Config(
-            input_files=[Path("test.py")], model_endpoint="http://localhost:8000"
-        )
+        config = make_config(model_endpoint="http://localhost:8000")
         improver = DocstringImprover(config)
 
         mock_generate_api.return_value = "Generated text"
@@ -134,9 +124,9 @@ class TestDocstringImprover:
         assert result == "Generated text"
         mock_generate_api.assert_called_once_with("Test prompt")
 
-    def test_create_template_docstring(self):
+    def test_create_template_docstring(self, default_config):
         """Test template docstring creation."""
-        config = Config(input_files=[Path("test.py")])
+        config = default_config
         improver = DocstringImprover(config)
 
         # Test with decent existing docstring - should return original
@@ -158,18 +148,13 @@ class TestDocstringImprover:
         assert isinstance(result, str)
         assert "Test Func" in result
 
-    @patch("torch.cuda.is_available", return_value=False)
-    @patch("transformers.AutoTokenizer.from_pretrained")
-    @patch("transformers.AutoModelForCausalLM.from_pretrained")
-    def test_generate_with_local_model_mocked(
-        self, mock_model_class, mock_tokenizer_class, mock_cuda
-    ):
+    def test_generate_with_local_model_mocked(self, mocked_transformers, make_config):
         """Test generating with local model (mocked)."""
-        config = Config(input_files=[Path("test.py")], model_endpoint=None)
+        config = make_config(model_endpoint=None)
         improver = DocstringImprover(config)
 
         # Mock tokenizer
-        mock_tokenizer = MagicMock()
+        mock_tokenizer = mocked_transformers.tokenizer
         mock_tokenizer.pad_token = None
         mock_tokenizer.eos_token = "<eos>"
         mock_tokenizer.return_value = {
@@ -177,14 +162,11 @@ class TestDocstringImprover:
             "attention_mask": [[1, 1, 1]],
         }
         mock_tokenizer.decode.return_value = "Generated text"
-        mock_tokenizer_class.return_value = mock_tokenizer
 
         # Mock model
-        mock_model = MagicMock()
         mock_output = MagicMock()
         mock_output.sequences = [[1, 2, 3, 4, 5]]
-        mock_model.generate.return_value = mock_output
-        mock_model_class.return_value = mock_model
+        mocked_transformers.model.generate.return_value = mock_output
 
         with patch.object(
             improver.model_config_loader, "load_config"
@@ -203,9 +185,5 @@ class TestDocstringImprover:
             result = improver._generate_with_local_model("Test prompt")
 
             assert isinstance(result, str)
-            mock_tokenizer_class.assert_called_once()
-            mock_model_class.assert_called_once()
-
-
-if __name__ == "__main__":
-    pytest.main([__file__])
+            mocked_transformers.tokenizer_loader.assert_called_once()
+            mocked_transformers.model_loader.assert_called_once()
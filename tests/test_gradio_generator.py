@@ -3,63 +3,60 @@
 Unit tests for the GradioGenerator class.
 """
 
-import sys
-from pathlib import Path
-from unittest.mock import MagicMock
+import dataclasses
 
-import pytest
-
-from source.config import Config
 from source.gradio_generator import GradioGenerator
 
-# Add source to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "source"))
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class FuncStub:
+    """Minimal stand-in for an MCPFunction."""
+
+    name: str
+    signature: str
 
 
 class TestGradioGenerator:
     """Test class for GradioGenerator functionality."""
 
-    def test_gradio_generator_initialization(self):
+    def test_gradio_generator_initialization(self, default_config):
         """Test GradioGenerator initialization."""
-        config = Config(input_files=[Path("test.py")])
+        config = default_config
         generator = GradioGenerator(config)
 
         assert generator.config == config
 
-    def test_generate_gradio_interface_single(self):
+    def test_generate_gradio_interface_single(self, default_config):
         """Test generating interface for a single function."""
-        config = Config(input_files=[Path("test.py")])
+        config = default_config
         generator = GradioGenerator(config)
 
         # Mock function
-        mock_func = MagicMock()
-        mock_func.name = "test_function"
-        mock_func.signature = "(name: str) -> str"
+        mock_func = FuncStub("test_function", "(name: str) -> str")
 
         improved_docstrings = {"test_function": "Test function that greets someone."}
 
         result = generator.generate_gradio_interface([mock_func], improved_docstrings)
 
         assert isinstance(result, str)
-        assert "gr.Interface" in result
-        assert "test_function" in result
-        assert "Test function that greets someone" in result
-        assert 'if __name__ == "__main__":' in result
-        assert ".launch(" in result
-
-    def test_generate_gradio_interface_multiple(self):
+        for token in (
+            "gr.Interface",
+            "test_function",
+            "Test function that greets someone",
+            'if __name__ == "__main__":',
+            ".launch(",
+        ):
+            assert token in result
+
+    def test_generate_gradio_interface_multiple(self, default_config):
         """Test generating interface for multiple functions."""
-        config = Config(input_files=[Path("test.py")])
+        config = default_config
         generator = GradioGenerator(config)
 
         # Mock functions
-        mock_func1 = MagicMock()
-        mock_func1.name = "function_one"
-        mock_func1.signature = "(a: int, b: int) -> int"
+        mock_func1 = FuncStub("function_one", "(a: int, b: int) -> int")
 
-        mock_func2 = MagicMock()
-        mock_func2.name = "function_two"
-        mock_func2.signature = "(text: str) -> str"
+        mock_func2 = FuncStub("function_two", "(text: str) -> str")
 
         functions = [mock_func1, mock_func2]
         improved_docstrings = {
@@ -70,36 +67,35 @@ class TestGradioGenerator:
         result = generator.generate_gradio_interface(functions, improved_docstrings)
 
         assert isinstance(result, str)
-        assert "gr.Blocks" in result
-        assert "gr.Tab" in result
-        assert "function_one" in result
-        assert "function_two" in result
-        assert "Function One" in result  # Title case conversion
-        assert "Function Two" in result
-        assert "Adds two numbers together" in result
-        assert "Processes text input" in result
-
-    def test_generate_single_interface_with_share(self):
+        for token in (
+            "gr.Blocks",
+            "gr.Tab",
+            "function_one",
+            "function_two",
+            "Function One",  # Title case conversion
+            "Function Two",
+            "Adds two numbers together",
+            "Processes text input",
+        ):
+            assert token in result
+
+    def test_generate_single_interface_with_share(self, make_config):
         """Test generating single interface with sharing enabled."""
-        config = Config(input_files=[Path("test.py")], share=True)
+        config = make_config(share=True)
         generator = GradioGenerator(config)
 
-        mock_func = MagicMock()
-        mock_func.name = "test_function"
-        mock_func.signature = "(name: str) -> str"
+        mock_func = FuncStub("test_function", "(name: str) -> str")
 
         result = generator._generate_single_interface(mock_func, "Test docstring")
 
         assert "share=True" in result
 
-    def test_generate_tabbed_interface_with_share(self):
+    def test_generate_tabbed_interface_with_share(self, make_config):
         """Test generating tabbed interface with sharing enabled."""
-        config = Config(input_files=[Path("test.py")], share=True)
+        config = make_config(share=True)
         generator = GradioGenerator(config)
 
-        mock_func = MagicMock()
-        mock_func.name = "test_function"
-        mock_func.signature = "(arg: str) -> str"
+        mock_func = FuncStub("test_function", "(arg: str) -> str")
 
         result = generator._generate_tabbed_interface(
             [mock_func], {"test_function": "Test docstring"}
@@ -107,9 +103,9 @@ class TestGradioGenerator:
 
         assert "share=True" in result
 
-    def test_extract_params_from_signature_string_param(self):
+    def test_extract_params_from_signature_string_param(self, default_config):
         """Test extracting string parameter from signature."""
-        config = Config(input_files=[Path("test.py")])
+        config = default_config
         generator = GradioGenerator(config)
 
         params = generator._extract_params_from_signature("(name: str) -> str")
@@ -117,9 +113,9 @@ class TestGradioGenerator:
         assert len(params) == 1
         assert params[0] == ("name", "str")
 
-    def test_extract_params_from_signature_int_param(self):
+    def test_extract_params_from_signature_int_param(self, default_config):
         """Test extracting integer parameter from signature."""
-        config = Config(input_files=[Path("test.py")])
+        config = default_config
         generator = GradioGenerator(config)
 
         params = generator._extract_params_from_signature("(num: int) -> int")
@@ -127,9 +123,9 @@ class TestGradioGenerator:
         assert len(params) == 1
         assert params[0] == ("num", "int")
 
-    def test_extract_params_from_signature_float_param(self):
+    def test_extract_params_from_signature_float_param(self, default_config):
         """Test extracting float parameter from signature."""
-        config = Config(input_files=[Path("test.py")])
+        config = default_config
         generator = GradioGenerator(config)
 
         params = generator._extract_params_from_signature("(value: float) -> float")
@@ -137,9 +133,9 @@ class TestGradioGenerator:
         assert len(params) == 1
         assert params[0] == ("value", "float")
 
-    def test_extract_params_from_signature_bool_param(self):
+    def test_extract_params_from_signature_bool_param(self, default_config):
         """Test extracting boolean parameter from signature."""
-        config = Config(input_files=[Path("test.py")])
+        config = default_config
         generator = GradioGenerator(config)
 
         params = generator._extract_params_from_signature("(flag: bool) -> str")
@@ -147,9 +143,9 @@ class TestGradioGenerator:
         assert len(params) == 1
         assert params[0] == ("flag", "bool")
 
-    def test_extract_params_from_signature_multiple_params(self):
+    def test_extract_params_from_signature_multiple_params(self, default_config):
         """Test extracting multiple parameters from signature."""
-        config = Config(input_files=[Path("test.py")])
+        config = default_config
         generator = GradioGenerator(config)
 
         params = generator._extract_params_from_signature(
@@ -162,18 +158,42 @@ class TestGradioGenerator:
         assert params[2] == ("height", "float")
         assert params[3] == ("active", "bool")
 
-    def test_extract_params_from_signature_no_params(self):
+    def test_extract_params_from_signature_generic_types(self, default_config):
+        """Test that subscripted types keep their inner commas."""
+        generator = GradioGenerator(default_config)
+
+        params = generator._extract_params_from_signature(
+            "(data: Dict[str, int], flag: bool) -> str"
+        )
+
+        assert params == [("data", "Dict[str, int]"), ("flag", "bool")]
+
+    def test_extract_params_from_signature_union_types(self, default_config):
+        """Test that unions of subscripted types stay one parameter."""
+        generator = GradioGenerator(default_config)
+
+        params = generator._extract_params_from_signature(
+            "(a: list[int] | None, b: dict[str, int], c: str) -> str"
+        )
+
+        assert params == [
+            ("a", "list[int] | None"),
+            ("b", "dict[str, int]"),
+            ("c", "str"),
+        ]
+
+    def test_extract_params_from_signature_no_params(self, default_config):
         """Test extracting from function with no parameters."""
-        config = Config(input_files=[Path("test.py")])
+        config = default_config
         generator = GradioGenerator(config)
 
         params = generator._extract_params_from_signature("() -> str")
 
         assert len(params) == 0
 
-    def test_extract_params_from_signature_no_types(self):
+    def test_extract_params_from_signature_no_types(self, default_config):
         """Test extracting from signature without type annotations."""
-        config = Config(input_files=[Path("test.py")])
+        config = default_config
         generator = GradioGenerator(config)
 
         params = generator._extract_params_from_signature("(name, age) -> str")
@@ -182,15 +202,13 @@ class TestGradioGenerator:
         assert params[0] == ("name", "str")  # defaults to str
         assert params[1] == ("age", "str")  # defaults to str
 
-    def test_title_case_conversion(self):
+    def test_title_case_conversion(self, default_config):
         """Test function name to title case conversion."""
-        config = Config(input_files=[Path("test.py")])
+        config = default_config
         generator = GradioGenerator(config)
 
         # Test in the context of tabbed interface
-        mock_func = MagicMock()
-        mock_func.name = "calculate_area_of_circle"
-        mock_func.signature = "(radius: float) -> float"
+        mock_func = FuncStub("calculate_area_of_circle", "(radius: float) -> float")
 
         result = generator._generate_tabbed_interface(
             [mock_func], {"calculate_area_of_circle": "Calculates area"}
@@ -198,14 +216,12 @@ class TestGradioGenerator:
 
         assert "Calculate Area Of Circle" in result
 
-    def test_interface_imports(self):
+    def test_interface_imports(self, default_config):
         """Test that generated interfaces include necessary imports."""
-        config = Config(input_files=[Path("test.py")])
+        config = default_config
         generator = GradioGenerator(config)
 
-        mock_func = MagicMock()
-        mock_func.name = "test_function"
-        mock_func.signature = "(arg: str) -> str"
+        mock_func = FuncStub("test_function", "(arg: str) -> str")
 
         # Test single interface
         single_result = generator._generate_single_interface(
@@ -219,18 +235,14 @@ class TestGradioGenerator:
         )
         assert "import gradio as gr" in tabbed_result
 
-    def test_interface_function_imports(self):
+    def test_interface_function_imports(self, default_config):
         """Test that generated interfaces import the functions."""
-        config = Config(input_files=[Path("test.py")])
+        config = default_config
         generator = GradioGenerator(config)
 
-        mock_func1 = MagicMock()
-        mock_func1.name = "function_one"
-        mock_func1.signature = "(arg: str) -> str"
+        mock_func1 = FuncStub("function_one", "(arg: str) -> str")
 
-        mock_func2 = MagicMock()
-        mock_func2.name = "function_two"
-        mock_func2.signature = "(arg: int) -> int"
+        mock_func2 = FuncStub("function_two", "(arg: int) -> int")
 
         # Test single function import
         single_result = generator._generate_single_interface(
@@ -247,45 +259,33 @@ class TestGradioGenerator:
             "from server.mcp_server import function_one, function_two" in tabbed_result
         )
 
-    def test_input_generation_for_different_types(self):
+    def test_input_generation_for_different_types(self, default_config):
         """Test that different parameter types generate appropriate Gradio inputs."""
-        config = Config(input_files=[Path("test.py")])
+        config = default_config
         generator = GradioGenerator(config)
 
         # Test string input
-        mock_func_str = MagicMock()
-        mock_func_str.name = "str_func"
-        mock_func_str.signature = "(text: str) -> str"
+        mock_func_str = FuncStub("str_func", "(text: str) -> str")
 
         result = generator._generate_single_interface(mock_func_str, "String function")
         assert "gr.Textbox" in result
 
         # Test float input
-        mock_func_float = MagicMock()
-        mock_func_float.name = "float_func"
-        mock_func_float.signature = "(value: float) -> float"
+        mock_func_float = FuncStub("float_func", "(value: float) -> float")
 
         result = generator._generate_single_interface(mock_func_float, "Float function")
         assert "gr.Number" in result
         assert "value=1.0" in result
 
         # Test int input
-        mock_func_int = MagicMock()
-        mock_func_int.name = "int_func"
-        mock_func_int.signature = "(num: int) -> int"
+        mock_func_int = FuncStub("int_func", "(num: int) -> int")
 
         result = generator._generate_single_interface(mock_func_int, "Int function")
         assert "gr.Number" in result
         assert "precision=0" in result
 
         # Test bool input
-        mock_func_bool = MagicMock()
-        mock_func_bool.name = "bool_func"
-        mock_func_bool.signature = "(flag: bool) -> bool"
+        mock_func_bool = FuncStub("bool_func", "(flag: bool) -> bool")
 
         result = generator._generate_single_interface(mock_func_bool, "Bool function")
         assert "gr.Checkbox" in result
-
-
-if __name__ == "__main__":
-    pytest.main([__file__])
@@ -0,0 +1,51 @@
+"""
+Unit tests for the logging_config module.
+"""
+
+import os
+
+import pytest
+
+from source.logging_config import _update_log_filenames
+
+
+def _handlers_config():
+    """Build the file handlers of json/log_config.json."""
+    return {
+        "handlers": {
+            "console": {"class": "logging.StreamHandler"},
+            "file": {
+                "class": "logging.FileHandler",
+                "filename": "gradio_mcp_builder.log",
+            },
+            "error_file": {
+                "class": "logging.FileHandler",
+                "filename": "gradio_mcp_builder_errors.log",
+            },
+        }
+    }
+
+
+class TestUpdateLogFilenames:
+    """Test class for log handler filename updates."""
+
+    @pytest.mark.parametrize(
+        "log_file, error_file",
+        [
+            (
+                "log/builds/output.log",
+                os.path.join("log", "builds", "output_errors.log"),
+            ),
+            (os.devnull, os.devnull),
+        ],
+    )
+    def test_update_log_filenames(self, log_file, error_file):
+        """Test that the main and error handlers follow the log file."""
+        config = _handlers_config()
+
+        _update_log_filenames(config, log_file)
+
+        handlers = config["handlers"]
+        assert handlers["file"]["filename"] == log_file
+        assert handlers["error_file"]["filename"] == error_file
+        assert "filename" not in handlers["console"]
@@ -3,126 +3,14 @@
 Unit tests for the MCPParser class.
 """
 
-import sys
-import tempfile
 from pathlib import Path
 
 import pytest
 
 from source.parser import MCPFunction, MCPParser
 
-# Add source to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "source"))
-
-
-class TestMCPFunction:
-    """Test the MCPFunction class."""
-
-    def test_mcp_function_creation(self):
-        """Test MCPFunction object creation."""
-
-        def dummy_func():
-            """Test function"""
-
-        func = MCPFunction("test_func", dummy_func, "Test docstring", "()")
-        assert func.name == "test_func"
-        assert func.func == dummy_func
-        assert func.docstring == "Test docstring"
-        assert func.signature == "()"
-
-    def test_mcp_function_repr(self):
-        """Test MCPFunction string representation."""
-        func = MCPFunction("test_func", None, "Test docstring", "(arg: str)")
-        expected = "MCPFunction(name='test_func', signature='(arg: str)')"
-        assert repr(func) == expected
-
-
-class TestMCPParser:
-    """Test the MCPParser class."""
-
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.parser = MCPParser()
-
-    def test_parser_initialization(self):
-        """Test parser initialization."""
-        parser = MCPParser()
-        assert hasattr(parser, "logger")
-        assert parser.mcp_functions == []
-        assert parser.other_functions == []
-        assert parser.module_docstring == ""
-
-    def test_parse_file_with_mcp_functions(self):
-        """Test parsing a file with MCP functions."""
-        # Create a temporary Python file with MCP functions
-        test_code = '''
-"""Test module docstring."""
-import mcp
-
-@mcp.tool()
-def greet(name: str) -> str:
-    """Greet someone by name."""
-    return f"Hello, {name}!"
-
-@mcp.tool()
-def add_numbers(a: float, b: float) -> float:
-    """Add two numbers together."""
-    return a + b
-
-def helper_function():
-    """A helper function without MCP decorator."""
-    return "helper"
-
-CONSTANT_VALUE = 42
-'''
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write(test_code)
-            temp_file = Path(f.name)
-
-        try:
-            result = self.parser.parse_file(temp_file)
-
-            # Check structure
-            assert "mcp_functions" in result
-            assert "helper_functions" in result
-            assert "module_constants" in result
-            assert "other_functions" in result
-            assert "module_docstring" in result
-            assert "module_imports" in result
-            assert "content" in result
-
-            # Check MCP functions
-            mcp_funcs = result["mcp_functions"]
-            assert len(mcp_funcs) == 2
-
-            # Check greet function
-            greet_func = next((f for f in mcp_funcs if f.name == "greet"), None)
-            assert greet_func is not None
-            assert greet_func.docstring == "Greet someone by name."
-            assert "(name: str)" in greet_func.signature
-
-            # Check add_numbers function
-            add_func = next((f for f in mcp_funcs if f.name == "add_numbers"), None)
-            assert add_func is not None
-            assert add_func.docstring == "Add two numbers together."
-            assert "(a: float, b: float)" in add_func.signature
-
-            # Check module docstring
-            assert result["module_docstring"] == "Test module docstring."
-
-            # Check helper functions
-            assert len(result["helper_functions"]) >= 1
-
-            # Check constants
-            assert len(result["module_constants"]) >= 1
-
-        finally:
-            temp_file.unlink()
-
-    def test_parse_file_no_mcp_functions(self):
-        """Test parsing a file with no MCP functions."""
-        test_code = '''
+# Sources for the parametrized parse cases, with what parsing each must yield
+NO_MCP_SOURCE = '''
 """Module without MCP functions."""
 
 def regular_function():
@@ -132,27 +20,7 @@ def regular_function():
 SOME_CONSTANT = "value"
 '''
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write(test_code)
-            temp_file = Path(f.name)
-
-        try:
-            result = self.parser.parse_file(temp_file)
-
-            # Should have no MCP functions
-            assert len(result["mcp_functions"]) == 0
-
-            # But should have other content
-            assert result["module_docstring"] == "Module without MCP functions."
-            assert len(result["helper_functions"]) >= 1
-            assert len(result["module_constants"]) >= 1
-
-        finally:
-            temp_file.unlink()
-
-    def test_parse_file_with_imports(self):
-        """Test parsing a file with various import styles."""
-        test_code = '''
+IMPORTS_SOURCE = '''
 import mcp
 import json
 from typing import List, Dict
@@ -164,25 +32,7 @@ def test_func():
     return "test"
 '''
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write(test_code)
-            temp_file = Path(f.name)
-
-        try:
-            result = self.parser.parse_file(temp_file)
-
-            imports = result["module_imports"]
-            assert any("import mcp" in imp for imp in imports)
-            assert any("import json" in imp for imp in imports)
-            assert any("from typing import List, Dict" in imp for imp in imports)
-            assert any("from pathlib import Path" in imp for imp in imports)
-
-        finally:
-            temp_file.unlink()
-
-    def test_parse_file_with_complex_signature(self):
-        """Test parsing functions with complex signatures."""
-        test_code = '''
+COMPLEX_SIGNATURE_SOURCE = '''
 import mcp
 from typing import List, Optional, Dict, Any
 
@@ -198,53 +48,7 @@ def complex_function(
     return {"result": "test"}
 '''
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write(test_code)
-            temp_file = Path(f.name)
-
-        try:
-            result = self.parser.parse_file(temp_file)
-
-            mcp_funcs = result["mcp_functions"]
-            assert len(mcp_funcs) == 1
-
-            func = mcp_funcs[0]
-            assert func.name == "complex_function"
-            # Should contain the main parameters
-            assert "arg1: str" in func.signature
-            assert "arg2: int" in func.signature
-
-        finally:
-            temp_file.unlink()
-
-    def test_parse_file_invalid_syntax(self):
-        """Test parsing a file with invalid Python syntax."""
-        test_code = """
-def invalid_syntax(
-    missing_closing_paren
-"""
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write(test_code)
-            temp_file = Path(f.name)
-
-        try:
-            with pytest.raises(SyntaxError):
-                self.parser.parse_file(temp_file)
-
-        finally:
-            temp_file.unlink()
-
-    def test_parse_nonexistent_file(self):
-        """Test parsing a nonexistent file."""
-        nonexistent_file = Path("this_file_does_not_exist.py")
-
-        with pytest.raises(FileNotFoundError):
-            self.parser.parse_file(nonexistent_file)
-
-    def test_parse_file_with_nested_functions(self):
-        """Test parsing file with nested functions."""
-        test_code = '''
+NESTED_FUNCTIONS_SOURCE = '''
 import mcp
 
 @mcp.tool()
@@ -267,24 +71,7 @@ def another_outer():
     return "outer"
 '''
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write(test_code)
-            temp_file = Path(f.name)
-
-        try:
-            result = self.parser.parse_file(temp_file)
-
-            # Should only find the top-level MCP function
-            mcp_funcs = result["mcp_functions"]
-            assert len(mcp_funcs) == 1
-            assert mcp_funcs[0].name == "outer_function"
-
-        finally:
-            temp_file.unlink()
-
-    def test_parse_file_with_class_methods(self):
-        """Test parsing file with class methods that have MCP decorators."""
-        test_code = '''
+CLASS_METHODS_SOURCE = '''
 import mcp
 
 class TestClass:
@@ -303,24 +90,200 @@ def standalone_function():
     return "standalone"
 '''
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write(test_code)
-            temp_file = Path(f.name)
+PARSE_CASES = [
+    pytest.param(
+        NO_MCP_SOURCE,
+        {
+            "mcp_functions": [],
+            "module_docstring": "Module without MCP functions.",
+            "has_helpers_and_constants": True,
+        },
+        id="no_mcp_functions",
+    ),
+    pytest.param(
+        IMPORTS_SOURCE,
+        {
+            "mcp_functions": ["test_func"],
+            "module_imports": [
+                "import mcp",
+                "import json",
+                "from typing import List, Dict",
+                "from pathlib import Path",
+            ],
+        },
+        id="with_imports",
+    ),
+    pytest.param(
+        COMPLEX_SIGNATURE_SOURCE,
+        {
+            "mcp_functions": ["complex_function"],
+            "signature": ["arg1: str", "arg2: int"],
+        },
+        id="with_complex_signature",
+    ),
+    # Only the top-level MCP function counts, not nested ones
+    pytest.param(
+        NESTED_FUNCTIONS_SOURCE,
+        {"mcp_functions": ["outer_function"]},
+        id="with_nested_functions",
+    ),
+    # Both the decorated method and the standalone function count
+    pytest.param(
+        CLASS_METHODS_SOURCE,
+        {"mcp_functions": ["method_with_mcp", "standalone_function"]},
+        id="with_class_methods",
+    ),
+]
 
-        try:
-            result = self.parser.parse_file(temp_file)
 
-            mcp_funcs = result["mcp_functions"]
-            # Should find both the method and standalone function
-            assert len(mcp_funcs) == 2
+class TestMCPFunction:
+    """Test the MCPFunction class."""
 
-            func_names = [f.name for f in mcp_funcs]
-            assert "method_with_mcp" in func_names
-            assert "standalone_function" in func_names
+    def test_mcp_function_creation(self):
+        """Test MCPFunction object creation."""
 
-        finally:
-            temp_file.unlink()
+        def dummy_func():
+            """Test function"""
 
+        func = MCPFunction("test_func", dummy_func, "Test docstring", "()")
+        assert func.name == "test_func"
+        assert func.func == dummy_func
+        assert func.docstring == "Test docstring"
+        assert func.signature == "()"
+
+    def test_mcp_function_repr(self):
+        """Test MCPFunction string representation."""
+        func = MCPFunction("test_func", None, "Test docstring", "(arg: str)")
+        expected = "MCPFunction(name='test_func', signature='(arg: str)')"
+        assert repr(func) == expected
 
-if __name__ == "__main__":
-    pytest.main([__file__])
+
+class TestMCPParser:
+    """Test the MCPParser class."""
+
+    def test_parser_initialization(self):
+        """Test parser initialization."""
+        parser = MCPParser()
+        assert hasattr(parser, "logger")
+        assert parser.mcp_functions == []
+        assert parser.other_functions == []
+        assert parser.module_docstring == ""
+
+    def test_parse_file_with_mcp_functions(self, mcp_parser, py_file):
+        """Test parsing a file with MCP functions."""
+        # Create a temporary Python file with MCP functions
+        test_code = '''
+"""Test module docstring."""
+import mcp
+
+@mcp.tool()
+def greet(name: str) -> str:
+    """Greet someone by name."""
+    return f"Hello, {name}!"
+
+@mcp.tool()
+def add_numbers(a: float, b: float) -> float:
+    """Add two numbers together."""
+    return a + b
+
+def helper_function():
+    """A helper function without MCP decorator."""
+    return "helper"
+
+CONSTANT_VALUE = 42
+'''
+
+        temp_file = py_file(test_code)
+
+        result = mcp_parser.parse_file(temp_file)
+
+        # Check structure
+        assert "mcp_functions" in result
+        assert "helper_functions" in result
+        assert "module_constants" in result
+        assert "other_functions" in result
+        assert "module_docstring" in result
+        assert "module_imports" in result
+        assert "content" in result
+
+        # Check MCP functions
+        mcp_funcs = result["mcp_functions"]
+        assert len(mcp_funcs) == 2
+
+        # Check greet function
+        greet_func = next((f for f in mcp_funcs if f.name == "greet"), None)
+        assert greet_func is not None
+        assert greet_func.docstring == "Greet someone by name."
+        assert "(name: str)" in greet_func.signature
+
+        # Check add_numbers function
+        add_func = next((f for f in mcp_funcs if f.name == "add_numbers"), None)
+        assert add_func is not None
+        assert add_func.docstring == "Add two numbers together."
+        assert "(a: float, b: float)" in add_func.signature
+
+        # Check module docstring
+        assert result["module_docstring"] == "Test module docstring."
+
+        # Check helper functions
+        assert len(result["helper_functions"]) >= 1
+
+        # Check constants
+        assert len(result["module_constants"]) >= 1
+
+    @pytest.mark.parametrize("test_code, expected", PARSE_CASES)
+    def test_parse_source_cases(self, mcp_parser, test_code, expected):
+        """Test parsing sources that cover the common module layouts."""
+        result = mcp_parser.parse_source(test_code)
+        mcp_funcs = result["mcp_functions"]
+
+        assert sorted(f.name for f in mcp_funcs) == sorted(expected["mcp_functions"])
+        if "module_docstring" in expected:
+            assert result["module_docstring"] == expected["module_docstring"]
+        for module_import in expected.get("module_imports", []):
+            assert any(module_import in imp for imp in result["module_imports"])
+        for fragment in expected.get("signature", []):
+            assert fragment in mcp_funcs[0].signature
+        if expected.get("has_helpers_and_constants"):
+            assert result["helper_functions"]
+            assert result["module_constants"]
+
+    def test_parse_source_invalid_syntax(self, mcp_parser):
+        """Test parsing a file with invalid Python syntax."""
+        test_code = """
+def invalid_syntax(
+    missing_closing_paren
+"""
+
+        with pytest.raises(SyntaxError):
+            mcp_parser.parse_source(test_code)
+
+    def test_parse_source_reuses_cached_result(self, mcp_parser):
+        """Test that parsing the same source twice reuses the first result."""
+        test_code = '''
+import mcp
+
+@mcp.tool()
+def cached_function():
+    """Cached function."""
+    return "cached"
+'''
+
+        first = mcp_parser.parse_source(test_code)
+        second = mcp_parser.parse_source(test_code)
+
+        # A cache hit hands back the very same parsed function objects
+        assert first["mcp_functions"][0] is second["mcp_functions"][0]
+
+        # Callers get their own lists, so mutating one leaves the cache intact
+        first["mcp_functions"].clear()
+        third = mcp_parser.parse_source(test_code)
+        assert [f.name for f in third["mcp_functions"]] == ["cached_function"]
+        assert mcp_parser.mcp_functions == third["mcp_functions"]
+
+    def test_parse_nonexistent_file(self, mcp_parser):
+        """Test parsing a nonexistent file."""
+        nonexistent_file = Path("this_file_does_not_exist.py")
+
+        with pytest.raises(FileNotFoundError):
+            mcp_parser.parse_file(nonexistent_file)